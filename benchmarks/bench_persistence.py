@@ -0,0 +1,60 @@
+"""_load_stats / _save_stats latency against synthetic session histories."""
+
+import json
+import tracemalloc
+
+from common import scratch_dir, timed
+from pomodoro_timer2 import StellarTimer
+from stellar_sessions import SessionColumns
+
+USERS = 20
+
+
+def synth_history(path, sessions: int):
+    """Write a journal log of ``sessions`` records spread over USERS navigators."""
+    log = path.with_name(path.name + '.log.jsonl')
+    with open(log, 'w') as f:
+        for i in range(sessions):
+            f.write(json.dumps({'user': f"nav{i % USERS:02d}",
+                                'date': f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T09:{i % 60:02d}:00",
+                                'distance': 250.0, 'duration': 1500.0,
+                                'completed': i % 4 != 0}, separators=(',', ':')) + '\n')
+
+
+def history_bytes(data, n: int) -> dict:
+    """Bytes per session held in memory: list of dicts vs SessionColumns."""
+    log = data.with_name(data.name + '.log.jsonl')
+    with open(log, 'rb') as f:
+        lines = [next(f) for _ in range(n)]
+    out = {}
+    for name, build in (('dicts', lambda: [json.loads(l) for l in lines]),
+                        ('columns', lambda: SessionColumns(json.loads(l) for l in lines))):
+        tracemalloc.start()
+        kept = build()
+        out[name] = round(tracemalloc.get_traced_memory()[0] / n, 1)
+        tracemalloc.stop()
+        del kept
+    return out
+
+
+def run(quick: bool = False) -> list:
+    sizes   = [1_000, 10_000] if quick else [1_000, 100_000, 1_000_000]
+    results = []
+    for n in sizes:
+        with scratch_dir() as d:
+            data = d / 'stats.json'
+            synth_history(data, n)
+            StellarTimer(data).store.compact()      # a steady-state snapshot
+            repeat = 3 if n >= 100_000 else 10
+            load   = timed(lambda: StellarTimer(data), repeat)
+            t      = StellarTimer(data)
+
+            def save():
+                t._add_session(10.0, 60.0, completed=True)
+            save_stats = timed(save, 50)
+            memory = history_bytes(data, min(n, 100_000))
+        results.append({'sessions': n,
+                        'load': load,
+                        'save': save_stats,
+                        'bytes_per_session': memory})
+    return results
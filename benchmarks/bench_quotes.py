@@ -0,0 +1,64 @@
+"""Quote corpus cost by size: index build, warm startup, peak RSS and reply latency."""
+
+import os
+import random
+import subprocess
+import sys
+
+from common import ROOT, scratch_dir
+
+# Fresh interpreter per probe, so ru_maxrss is the cost of that one load. Replies
+# fault in the (shared, reclaimable) page-cache pages of the quotes they return.
+PROBE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from stellar_quotes import QuoteEngine
+from pomodoro_timer2 import QUOTES, CHAT_ROUTES
+rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+engine = QuoteEngine(QUOTES, CHAT_ROUTES, corpus_dir={corpus!r})
+ms = (time.perf_counter() - t0) * 1000
+rss1 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+for _ in range(10000):
+    engine.reply('a kant quote about reason please')
+us = (time.perf_counter() - t0) * 100
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(ms, us, rss1 - rss0, rss - rss0, len(engine.store))
+"""
+
+CATEGORIES = ('kant', 'iro', 'lyrics', 'heroic')
+
+
+def synth_corpus(corpus_dir, quotes: int):
+    """``quotes`` random ~80-character quotes spread over a few category files."""
+    rng   = random.Random(17)
+    words = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(2, 9))) for _ in range(5000)]
+    per   = quotes // len(CATEGORIES)
+    for cat in CATEGORIES:
+        with open(corpus_dir / f"{cat}.txt", 'w') as f:
+            f.write(f"# keywords: {cat}, {cat}ish\n")
+            for _ in range(per):
+                f.write(' '.join(rng.choices(words, k=14)) + '\n')
+
+
+def probe(corpus_dir) -> dict:
+    out = subprocess.run([sys.executable, '-c', PROBE.format(root=str(ROOT), corpus=str(corpus_dir))],
+                         env=dict(os.environ), stdin=subprocess.DEVNULL, capture_output=True, text=True,
+                         check=True)
+    ms, us, load, replies, n = out.stdout.split()[-5:]
+    return {'load_ms': round(float(ms), 1), 'reply_us': round(float(us), 2), 'quotes': int(n),
+            'rss_load_mib': round(int(load) / 1024, 1), 'rss_10k_replies_mib': round(int(replies) / 1024, 1)}
+
+
+def run(quick: bool = False) -> list:
+    sizes   = [10_000, 100_000] if quick else [10_000, 100_000, 1_000_000]
+    results = []
+    for n in sizes:
+        with scratch_dir() as d:
+            synth_corpus(d, n)
+            corpus_mib = sum(p.stat().st_size for p in d.glob('*.txt')) / 2**20
+            row = {'corpus_quotes': n, 'corpus_mib': round(corpus_mib, 1), 'cold': probe(d)}
+            row['warm'] = probe(d)                       # sidecar indexes now exist
+        results.append(row)
+    return results
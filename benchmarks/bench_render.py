@@ -0,0 +1,73 @@
+"""Frame build time and bytes emitted by StellarTimer._draw_ui, plus starfield allocations."""
+
+import tracemalloc
+
+from common import FakeStdout, scratch_dir, terminal_size, timed
+from pomodoro_timer2 import StellarTimer
+from stellar_clock import MissionClock
+
+SIZES = [(80, 24), (120, 40), (200, 60), (300, 80), (400, 120)]
+
+
+def _timer(data_dir, fake_now):
+    t = StellarTimer(data_dir / 'stats.json')
+    t.renderer.out  = FakeStdout()
+    t.distance_goal = 500
+    t.time_goal     = 3000.0
+    t.clock         = MissionClock(t.time_goal, now=lambda: fake_now[0])
+    t.clock.start(1234.5)
+    return t
+
+
+def bench_draw_ui(frames: int) -> list:
+    results = []
+    for cols, rows in SIZES:
+        with scratch_dir() as d, terminal_size(cols, rows):
+            now = [0.0]
+            t   = _timer(d, now)
+            out = t.renderer.out
+            t._draw_ui()
+            full = out.bytes
+
+            def tick():
+                now[0] += 0.1          # one 10 Hz clock tick per frame
+                t._draw_ui()
+            before = out.bytes
+            stats  = timed(tick, frames)
+            moving = (out.bytes - before) / frames
+
+            before = out.bytes
+            for _ in range(frames):     # paused / nothing changed
+                t._draw_ui()
+            idle = (out.bytes - before) / frames
+        results.append({'size': f"{cols}x{rows}", 'full_frame_bytes': full,
+                        'bytes_per_tick': round(moving, 1), 'bytes_per_idle_frame': round(idle, 1),
+                        **stats})
+    return results
+
+
+def bench_starfield(frames: int) -> list:
+    results = []
+    for cols, rows in SIZES:
+        with scratch_dir() as d:
+            t = _timer(d, [0.0])
+            t._draw_starfield(cols, rows)           # first call builds the layer
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            keep = [None]
+            for i in range(frames):
+                t.star_offset = i % 300
+                keep[0] = t._draw_starfield(cols, rows)
+            _, peak = tracemalloc.get_traced_memory()
+            diff = tracemalloc.take_snapshot().compare_to(before, 'filename')
+            tracemalloc.stop()
+            results.append({'size': f"{cols}x{rows}",
+                            'retained_blocks_per_frame': sum(max(s.count_diff, 0) for s in diff),
+                            'peak_kib': round(peak / 1024, 1)})
+    return results
+
+
+def run(quick: bool = False) -> dict:
+    frames = 50 if quick else 300
+    return {'draw_ui': bench_draw_ui(frames), 'starfield': bench_starfield(frames)}
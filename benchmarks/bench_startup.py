@@ -0,0 +1,50 @@
+"""Startup cost of each timer against a large stats history: wall time and peak RSS."""
+
+import os
+import subprocess
+import sys
+
+from bench_persistence import synth_history
+from common import ROOT, scratch_dir
+
+# Each probe runs in a fresh interpreter with HOME pointed at the scratch dir,
+# so ru_maxrss is the cost of that one startup.
+PROBE = """
+import resource, sys, time
+sys.path[:0] = [{root!r}, {root!r} + '/cosmic/system']
+t0 = time.perf_counter()
+{body}
+ms = (time.perf_counter() - t0) * 1000
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(ms, rss)
+"""
+
+SUBJECTS = {
+    'stellar_timer': "from pomodoro_timer2 import StellarTimer; t = StellarTimer(); t._total_distance()",
+    'backup_timer':  "from backup_timer import PomodoroTimer; t = PomodoroTimer()",
+    'poyo':          "from poyo import CosmicTimer; t = CosmicTimer()",
+}
+BASELINE = "import pomodoro_timer2, backup_timer, poyo"
+
+
+def probe(home, body: str) -> dict:
+    env = dict(os.environ, HOME=str(home))
+    out = subprocess.run([sys.executable, '-c', PROBE.format(root=str(ROOT), body=body)], env=env,
+                         stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True)
+    ms, rss = out.stdout.split()[-2:]
+    return {'ms': round(float(ms), 1), 'peak_rss_mib': round(int(rss) / 1024, 1)}
+
+
+def run(quick: bool = False) -> list:
+    sizes   = [10_000] if quick else [10_000, 1_000_000]
+    results = []
+    for n in sizes:
+        with scratch_dir() as d:
+            row = {'sessions': n, 'imports_only': probe(d, BASELINE)}
+            synth_history(d / '.pomodoro_stats.json', n)
+            probe(d, SUBJECTS['stellar_timer'])           # first start writes the snapshot
+            # All three timers read the same store
+            for name, body in SUBJECTS.items():
+                row[name] = probe(d, body)
+        results.append(row)
+    return results
@@ -0,0 +1,41 @@
+"""Tick-loop drift over a simulated hour: legacy 0.1 s accumulation vs MissionClock."""
+
+import random
+
+from stellar_clock import MissionClock
+
+HOUR = 3600.0
+
+
+def legacy(seconds: float, jitter: float, rng) -> dict:
+    # elapsed += 0.1 after every sleep(0.1); each sleep overshoots by the jitter
+    wall = shown = 0.0
+    wakes = 0
+    while shown < seconds:
+        wall  += 0.1 + rng.uniform(0, jitter)
+        shown += 0.1
+        wakes += 1
+    return {'drift_s': round(wall - shown, 3), 'finished_late_s': round(wall - seconds, 3), 'wakeups': wakes}
+
+
+def monotonic(seconds: float, jitter: float, rng) -> dict:
+    now   = [0.0]
+    clock = MissionClock(seconds, now=lambda: now[0])
+    clock.start()
+    wakes = 0
+    while not clock.done:
+        e = clock.elapsed
+        now[0] += (clock.next_deadline(e) - e) + rng.uniform(0, jitter)
+        wakes  += 1
+    return {'drift_s': round(now[0] - clock.elapsed, 3), 'finished_late_s': round(now[0] - seconds, 3),
+            'wakeups': wakes}
+
+
+def run(quick: bool = False) -> list:
+    results = []
+    for jitter_ms in (0.5, 2.0, 10.0):
+        j = jitter_ms / 1000
+        results.append({'jitter_ms': jitter_ms,
+                        'legacy':    legacy(HOUR, j, random.Random(1)),
+                        'monotonic': monotonic(HOUR, j, random.Random(1))})
+    return results
@@ -0,0 +1,55 @@
+"""Shared helpers for the benchmark suite."""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+class FakeStdout:
+    """Counts what would have reached the terminal."""
+
+    def __init__(self):
+        self.bytes  = 0
+        self.writes = 0
+
+    def write(self, s: str):
+        self.bytes  += len(s.encode('utf-8'))
+        self.writes += 1
+
+    def flush(self):
+        pass
+
+
+@contextmanager
+def terminal_size(cols: int, rows: int):
+    real = os.get_terminal_size
+    os.get_terminal_size = lambda *a: os.terminal_size((cols, rows))
+    try:
+        yield
+    finally:
+        os.get_terminal_size = real
+
+
+@contextmanager
+def scratch_dir():
+    with tempfile.TemporaryDirectory(prefix='stellar-bench-') as d:
+        yield Path(d)
+
+
+def timed(fn, repeat: int) -> dict:
+    """Per-call wall time stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    samples.sort()
+    return {'mean_ms': round(sum(samples) / len(samples), 4),
+            'p50_ms':  round(samples[len(samples) // 2], 4),
+            'p99_ms':  round(samples[min(int(len(samples) * 0.99), len(samples) - 1)], 4)}
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Crash-recovery check for the session checkpoint, on every backend.
+
+Each timer is killed (os._exit, so nothing is flushed or cleared) at
+one point of recording a session, then started again to recover it,
+then started once more:
+
+  active   mid-session, with only the ACTIVE checkpoint on disk
+  final    after the stats write, before the checkpoint is cleared
+  before   after the FINAL checkpoint, before the stats write
+
+Every case must end with exactly one session in the store, nothing left
+to recover, and no change from the second recovery.
+
+On the journal each timer also records a session after another writer
+was killed halfway through appending its log line (``torn``); that
+session must still be in the log for a fresh reader.
+
+    python3 benchmarks/crash_recover.py [--only sqlite]
+"""
+
+import argparse
+import builtins
+import json
+import os
+import subprocess
+import sys
+
+from common import ROOT, scratch_dir
+from stress_writes import tally, timer
+
+BACKENDS = ('journal', 'sqlite')
+TIMERS   = ('stellar', 'backup')
+POINTS   = ('active', 'final', 'before')
+
+
+# ─── Child ────────────────────────────────────────────────────────────────────
+def crash(which: str, point: str):
+    """Start a session in a fresh timer and die at ``point`` of recording it."""
+    t = timer('journal' if which == 'stellar' else 'backup')
+    recover = t._recover if which == 'stellar' else t.recover
+    record  = (t._add_session if which == 'stellar'
+               else lambda d, e: t.add_session(t.user_name, d, e))
+    recover()                                           # opens the checkpoint; nothing to settle yet
+    if point == 'active':
+        t.time_goal, t.distance_goal, t.running = 600.0, 100, True
+        t.elapsed = 42.0
+        (t._checkpoint if which == 'stellar' else t.save_checkpoint)()
+    elif point == 'final':
+        t.checkpoint.clear = lambda: os._exit(1)
+        record(42.0, 252.0)
+    else:
+        t.store.append = lambda *a: os._exit(1)
+        record(42.0, 252.0)
+    os._exit(1)
+
+
+def tear():
+    """Die halfway through appending a log line, holding the lock like a real writer."""
+    from stellar_store import file_lock
+    store = timer('journal').store
+    line  = json.dumps({'user': 'torn', 'date': '2024-01-01T00:00:00', 'distance': 1.0,
+                        'duration': 1.0, 'completed': True})
+    with file_lock(store.legacy), open(store.log_path, 'a') as f:
+        f.write(line[:len(line) // 2])
+        f.flush()
+        os._exit(1)
+
+
+def outlive(which: str):
+    """With the store already open, let a peer tear the log, then record one session."""
+    t = timer('journal' if which == 'stellar' else 'backup')
+    t.store.totals(t.user_name)                         # loaded before the peer dies
+    child(dict(os.environ), '--tear')
+    if which == 'stellar':
+        t._add_session(42.0, 252.0)
+    else:
+        t.add_session(t.user_name, 42.0, 252.0)
+
+
+def settle(which: str) -> dict:
+    """Start the timer again, decline to resume, and report what the store holds."""
+    builtins.input = lambda *a: 'n'
+    t = timer('journal' if which == 'stellar' else 'backup')
+    (t._recover if which == 'stellar' else t.recover)()
+    return {'sessions': t.store.totals(t.user_name)['session_count'], 'pending': t.checkpoint.load() is not None}
+
+
+# ─── Parent ───────────────────────────────────────────────────────────────────
+def child(env: dict, *args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, __file__, *args], env=env, cwd=env['HOME'],
+                          stdin=subprocess.DEVNULL, capture_output=True, text=True)
+
+
+def check(backend: str, which: str, point: str) -> dict:
+    with scratch_dir() as home:
+        env     = dict(os.environ, HOME=str(home), STELLAR_BACKEND=backend, PYTHONPATH=str(ROOT))
+        crashed = child(env, '--crash', which, point).returncode == 1
+        runs    = []
+        for _ in range(2):
+            out = child(env, '--settle', which)
+            runs.append(json.loads(out.stdout.splitlines()[-1]) if out.returncode == 0 else None)
+    ok = crashed and all(r == {'sessions': 1, 'pending': False} for r in runs)
+    return {'backend': backend, 'timer': which, 'crash': point,
+            'sessions': [r and r['sessions'] for r in runs], 'ok': ok}
+
+
+def check_torn(which: str) -> dict:
+    with scratch_dir() as home:
+        env = dict(os.environ, HOME=str(home), STELLAR_BACKEND='journal', PYTHONPATH=str(ROOT))
+        ran = child(env, '--outlive', which).returncode == 0
+        got = tally('journal' if which == 'stellar' else 'backup', env)
+    sessions = sum(n for n, _ in got.values())
+    return {'backend': 'journal', 'timer': which, 'crash': 'torn', 'sessions': [sessions],
+            'ok': ran and sessions == 1}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Kill a timer mid-save and check recovery records the session once")
+    ap.add_argument('--only', choices=BACKENDS, action='append')
+    ap.add_argument('--crash', nargs=2, metavar=('TIMER', 'POINT'), help=argparse.SUPPRESS)
+    ap.add_argument('--settle', choices=TIMERS, help=argparse.SUPPRESS)
+    ap.add_argument('--outlive', choices=TIMERS, help=argparse.SUPPRESS)
+    ap.add_argument('--tear', action='store_true', help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.crash:
+        crash(*args.crash)
+    if args.tear:
+        tear()
+    if args.outlive:
+        outlive(args.outlive)
+        sys.exit(0)
+    if args.settle:
+        print(json.dumps(settle(args.settle)))
+        sys.exit(0)
+    results = [check(b, w, p) for b in args.only or BACKENDS for w in TIMERS for p in POINTS]
+    if 'journal' in (args.only or BACKENDS):
+        results += [check_torn(w) for w in TIMERS]
+    for r in results:
+        print(json.dumps(r), flush=True)
+    sys.exit(0 if all(r['ok'] for r in results) else 1)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the render, tick and persistence hot paths.
+
+    python3 benchmarks/run.py            — full run (1M-session histories, slow)
+    python3 benchmarks/run.py --quick    — smaller inputs for a fast check
+
+Results are written as JSON to benchmarks/results/<version>-<commit>.json
+so runs from different versions can be diffed.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import common
+import bench_persistence
+import bench_quotes
+import bench_render
+import bench_startup
+import bench_tick
+
+SUITES = {'render': bench_render, 'persistence': bench_persistence, 'startup': bench_startup,
+          'tick': bench_tick, 'quotes': bench_quotes}
+
+
+def meta() -> dict:
+    version = json.loads((common.ROOT / 'cosmic/system/version.json').read_text())['version']
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=common.ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'version': version, 'commit': commit or 'unknown', 'python': platform.python_version(),
+            'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument('--quick', action='store_true', help="smaller inputs")
+    ap.add_argument('--only', choices=sorted(SUITES), action='append', help="run just these suites")
+    ap.add_argument('--out', help="output file (default: benchmarks/results/<version>-<commit>.json)")
+    args = ap.parse_args()
+
+    report = {'meta': meta(), 'quick': args.quick}
+    for name in args.only or SUITES:
+        print(f"✦ {name} ...", file=sys.stderr, flush=True)
+        report[name] = SUITES[name].run(args.quick)
+
+    out = common.Path(args.out) if args.out else \
+        common.ROOT / 'benchmarks/results' / f"{report['meta']['version']}-{report['meta']['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+    print(f"✦ Results written to {out}", file=sys.stderr)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Concurrent-writer stress test for the stats file.
+
+Starts PROCS processes that each record WRITES sessions into the same
+HOME at once, through every writer that touches it, then checks that
+nothing was lost: every session is on disk and the totals add up.
+The ``mixed`` run starts StellarTimer, backup and poyo writers together
+in one HOME and checks that each of the three timers' leaderboards
+sees all of their sessions.
+
+    python3 benchmarks/stress_writes.py [--procs 8] [--writes 50]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from common import ROOT, scratch_dir
+
+KINDS = ('journal', 'sqlite', 'backup', 'poyo', 'mixed')
+MIXED = ('journal', 'backup', 'poyo')      # the timers sharing one HOME in the mixed run
+POYO  = 'Cosmic Kirbs'                     # poyo always writes as this navigator
+
+
+# ─── Worker / reader (run in a child process) ─────────────────────────────────
+def timer(kind: str):
+    """The timer program behind ``kind``, opened on $HOME's stats like a user would."""
+    from pathlib import Path
+    if kind in ('journal', 'sqlite'):
+        from pomodoro_timer2 import StellarTimer
+        return StellarTimer(Path.home() / '.pomodoro_stats.json')
+    if kind == 'backup':
+        sys.path.insert(0, str(ROOT / 'cosmic' / 'system'))
+        from backup_timer import PomodoroTimer
+        return PomodoroTimer()
+    from poyo import CosmicTimer
+    from stellar_clock import MissionClock
+    p = CosmicTimer()
+    p.clock = MissionClock(elapsed=60.0)        # one minute = 10 m per mission
+    return p
+
+
+def worker(kind: str, writes: int, who: str):
+    t = timer(kind)
+    for _ in range(writes):
+        if kind in ('journal', 'sqlite'):
+            t._add_session(10.0, 60.0, user=who)
+        elif kind == 'backup':
+            t.add_session(who, 10.0, 60.0)
+        else:
+            t.log_mission()
+
+
+def reader(kind: str) -> dict:
+    """{user: [sessions, distance]} on ``kind``'s own leaderboard."""
+    return {u: [a['session_count'], a['total_distance']] for u, a in timer(kind).store.leaderboard()}
+
+
+# ─── Checks (parent) ──────────────────────────────────────────────────────────
+def backend(kind: str) -> str:
+    """Store the writer records into; the backup and poyo timers use the default journal."""
+    return 'sqlite' if kind == 'sqlite' else 'journal'
+
+
+def tally(kind: str, env: dict) -> dict:
+    """{user: (sessions, distance)} as a fresh ``kind`` timer sees it; {} if it cannot start."""
+    out = subprocess.run([sys.executable, __file__, '--reader', kind], env=env, cwd=env['HOME'],
+                         stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    if out.returncode != 0:
+        return {}
+    return {u: tuple(v) for u, v in json.loads(out.stdout.splitlines()[-1]).items()}
+
+
+def missing(got: dict, want: dict) -> int:
+    """Sessions in ``want`` that ``got`` lacks (negative for extras); -1 if a distance is off."""
+    lost = sum(n - got.get(u, (0, 0))[0] for u, (n, _) in want.items())
+    if not lost and any(abs(got[u][1] - d) > 1e-6 for u, (_, d) in want.items()):
+        return -1
+    return lost
+
+
+def stress(kind: str, procs: int, writes: int) -> dict:
+    """``procs`` writers of ``kind`` (of each MIXED timer for 'mixed') at once, then every reader's view."""
+    kinds = MIXED if kind == 'mixed' else (kind,)
+    plan  = [(k, f"{k}{i:02d}" if kind == 'mixed' else f"nav{i:02d}") for k in kinds for i in range(procs)]
+    want  = {who: (writes, writes * 10.0) for k, who in plan if k != 'poyo'}
+    if 'poyo' in kinds:
+        want[POYO] = (procs * writes, procs * writes * 10.0)
+    with scratch_dir() as home:
+        env = dict(os.environ, HOME=str(home), STELLAR_BACKEND=backend(kind), PYTHONPATH=str(ROOT))
+        t0 = time.perf_counter()
+        children = [subprocess.Popen([sys.executable, __file__, '--worker', k,
+                                      '--writes', str(writes), '--user', who],
+                                     env=env, cwd=home, stdout=subprocess.DEVNULL)
+                    for k, who in plan]
+        failed = sum(1 for c in children if c.wait() != 0)
+        seconds = time.perf_counter() - t0
+        # Every timer sharing the store must see every session, not just its own
+        lost = {k: missing(tally(k, env), want) for k in kinds}
+    return {'writer': kind, 'procs': len(plan), 'writes': len(plan) * writes,
+            'lost': lost if kind == 'mixed' else lost[kind], 'failed_procs': failed,
+            'seconds': round(seconds, 2), 'ok': not failed and not any(lost.values())}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Many processes writing the stats file at once")
+    ap.add_argument('--procs', type=int, default=8, help="writers per timer")
+    ap.add_argument('--writes', type=int, default=50, help="sessions recorded per process")
+    ap.add_argument('--only', choices=KINDS, action='append')
+    ap.add_argument('--worker', choices=MIXED + ('sqlite',), help=argparse.SUPPRESS)
+    ap.add_argument('--reader', choices=MIXED + ('sqlite',), help=argparse.SUPPRESS)
+    ap.add_argument('--user', default='nav00', help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.reader:
+        print(json.dumps(reader(args.reader)))
+        sys.exit(0)
+    if args.worker:
+        worker(args.worker, args.writes, args.user)
+        sys.exit(0)
+    results = [stress(k, args.procs, args.writes) for k in args.only or KINDS]
+    for r in results:
+        print(json.dumps(r), flush=True)
+    sys.exit(0 if all(r['ok'] for r in results) else 1)
@@ -9,13 +9,21 @@ import sys
 import os
 import threading
 import random
-import json
 from datetime import datetime
 from pathlib import Path
 # # from tkinter.tix import Meter
 
+# Shared engine modules live at the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from stellar_checkpoint import ACTIVE, Checkpoint, checkpoint_path, recorded
+from stellar_clock import MissionClock, VirtualTime, wall_time
+from stellar_quotes import QuoteEngine
+from stellar_starfield import Starfield
+from stellar_store import open_store
+
 # Configuration
 DATA_FILE = Path.home() / '.pomodoro_stats.json'
+STATS_BACKEND = os.environ.get('STELLAR_BACKEND', 'journal')  # same store as pomodoro_timer2
 METERS_PER_MINUTE = 10
 
 # Philosophical Quotes
@@ -69,6 +77,15 @@ QUOTES = {
     'back': ['Returning to the cockpit...', 'Ready for ignition.', 'Focus mode: Reactivated.']
 }
 
+# Chat routing, earliest match wins; anything else gets a random category
+CHAT_ROUTES = (
+    ('iro', ('iro', 'tea', 'wisdom', 'uncle')),
+    ('bronte', ('bronte', 'emily', 'love', 'soul')),
+    ('kant', ('kant', 'moral', 'reason', 'science')),
+    ('lyrics', ('song', 'music', 'sing', 'lyric')),
+    ('heroic', ('hero', 'courage', 'brave', 'strong')),
+)
+
 BREAK_ADVICES = [
     "Take a 5-minute walk to refresh your mind.",
     "Stretch your body and relax your shoulders.",
@@ -95,101 +112,105 @@ COLORS = {
 }
 
 class PomodoroTimer:
-    def __init__(self):
+    def __init__(self, now=time.monotonic):
         self.distance_goal = 0  # Meter;
         self.time_goal = 0  # min;
-        self.elapsed = 0
+        self.now = now  # time source; a VirtualTime in --simulate
+        self.clock = MissionClock(now=now)
         self.running = False
-        self.paused = False
         self.chat_messages = []
+        self.quotes = None
         self.user_name = "Cosmic Kirbs"
-        self.stats = self.load_stats()
+        # Shared with pomodoro_timer2 and poyo, so the leaderboard holds every navigator
+        self.store = open_store(STATS_BACKEND, DATA_FILE)
         self.star_offset = 0
+        self.starfield = Starfield(['·', '∙', '•', '*', '✦', '✧'], density=40)
         self.bg_color = 'deep_space'
         self.timer_thread = None
+        self.checkpoint = None  # opened by run(); --simulate goes without
         
-    def load_stats(self):
-        """Load statistics from file"""
-        if DATA_FILE.exists():
-            with open(DATA_FILE, 'r') as f:
-                return json.load(f)
-        return {}
-    
-    def save_stats(self):
-        """Save statistics to file immediately"""
-        with open(DATA_FILE, 'w') as f:
-            json.dump(self.stats, f, indent=2)
-    
-    def add_session(self, username, distance, duration, completed=True):
+    @property
+    def elapsed(self):
+        """Elapsed focus seconds, read from the monotonic mission clock"""
+        return self.clock.elapsed
+
+    @elapsed.setter
+    def elapsed(self, value):
+        self.clock.stop()
+        self.clock = MissionClock(self.time_goal, elapsed=value, now=self.now)
+
+    @property
+    def paused(self):
+        return self.clock.is_held('user')
+
+    @paused.setter
+    def paused(self, value):
+        if value:
+            self.clock.pause('user')
+        else:
+            self.clock.resume('user')
+        self.save_checkpoint()
+
+    def add_session(self, username, distance, duration, completed=True, date=None):
         """Add a session to stats and save immediately"""
-        if username not in self.stats:
-            self.stats[username] = {
-                'sessions': [],
-                'total_distance': 0,
-                'total_time': 0,
-                'completed_sessions': 0
-            }
-        
         session = {
-            'date': datetime.now().isoformat(),
+            'date': date or wall_time(self.now).isoformat(),
             'distance': distance,
             'duration': duration,
             'completed': completed
         }
-        
-        self.stats[username]['sessions'].append(session)
-        self.stats[username]['total_distance'] += distance
-        self.stats[username]['total_time'] += duration
-        if completed:
-            self.stats[username]['completed_sessions'] += 1
-        
-        self.save_stats()
+        if self.checkpoint:
+            self.checkpoint.finish(username, session)
+        self.store.append(username, session)
+        if self.checkpoint:
+            self.checkpoint.clear()
+    
+    def save_checkpoint(self):
+        """Overwrite the in-progress checkpoint in place (fixed size, history untouched)"""
+        if self.checkpoint and self.running:
+            self.checkpoint.save(self.user_name, wall_time(self.now).isoformat(),
+                                 self.elapsed, self.time_goal, self.distance_goal)
+    
+    def recover(self):
+        """Settle a session a crashed run left behind; True if the user resumes it"""
+        if self.checkpoint is None:
+            self.checkpoint = Checkpoint.open(checkpoint_path(DATA_FILE, 'backup'))
+        rec = self.checkpoint and self.checkpoint.load()
+        if rec is None:
+            return False
+        if rec.state == ACTIVE:
+            distance_covered = (rec.elapsed / 60) * METERS_PER_MINUTE
+            choice = input(f"{COLORS['solar']}Interrupted session found: {distance_covered:.0f}m of "
+                           f"{rec.distance:.0f}m. Resume? (y/n): {COLORS['reset']}").strip().lower()
+            if choice == 'y':
+                self.distance_goal = int(rec.distance)
+                self.time_goal = rec.goal
+                self.elapsed = rec.elapsed
+                return True
+            self.add_session(rec.user, distance_covered, int(rec.elapsed), completed=False, date=rec.date)
+        elif recorded(self.store, rec):
+            self.checkpoint.clear()
+        else:
+            self.add_session(rec.user, rec.distance, rec.elapsed, rec.completed, date=rec.date)
+        return False
+    
+    def quote_engine(self):
+        """Quote corpus and keyword matcher, built on first use"""
+        if self.quotes is None:
+            self.quotes = QuoteEngine(QUOTES, CHAT_ROUTES)
+        return self.quotes
     
     def get_bot_response(self, user_message):
         """Get a philosophical quote based on user message"""
-        msg_lower = user_message.lower()
-        
-        # Keyword detection for quote categories
-        if any(word in msg_lower for word in ['iro', 'tea', 'wisdom', 'uncle']):
-            category = 'iro'
-        elif any(word in msg_lower for word in ['bronte', 'emily', 'love', 'soul']):
-            category = 'bronte'
-        elif any(word in msg_lower for word in ['kant', 'moral', 'reason', 'science']):
-            category = 'kant'
-        elif any(word in msg_lower for word in ['song', 'music', 'sing', 'lyric']):
-            category = 'lyrics'
-        elif any(word in msg_lower for word in ['hero', 'courage', 'brave', 'strong']):
-            category = 'heroic'
-        else:
-            # Random category
-            category = random.choice(list(QUOTES.keys()))
-        
-        return random.choice(QUOTES.get(category, QUOTES.get('wisdom', ['Stay focused.'])))
+        return self.quote_engine().reply(user_message)
     
     def clear_screen(self):
         """Clear terminal screen"""
         os.system('clear' if os.name != 'nt' else 'cls')
     
     def draw_stars(self, width, height):
-        """Draw moving star field"""
-        stars = []
-        star_chars = ['·', '∙', '•', '*', '✦', '✧']
-        num_stars = (width * height) // 40
-        
-        for _ in range(num_stars):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height - 1)
-            char = random.choice(star_chars)
-            stars.append((x, y, char))
-        
-        grid = [[' ' for _ in range(width)] for _ in range(height)]
-        
-        for x, y, char in stars:
-            new_x = (x + self.star_offset) % width
-            if 0 <= new_x < width and 0 <= y < height:
-                grid[y][new_x] = char
-        
-        return grid
+        """Draw moving star field (precomputed layer, rotated by star_offset); one string per row"""
+        return self.starfield.rows(width, height, self.star_offset, self.star_offset // 5)
     
     def draw_ui(self):
         """Draw the main UI"""
@@ -202,6 +223,7 @@ class PomodoroTimer:
         
         # Apply background color
         print(COLORS[self.bg_color], end='')
+        self.star_offset = int(self.elapsed * 10) % 100
         
         star_grid = self.draw_stars(cols, rows - 1)
         
@@ -226,80 +248,64 @@ class PomodoroTimer:
         else:
             status = f"{COLORS['red']}⏹ STOPPED{COLORS[self.bg_color]}"
         
+        def overlay(line, text, start=0):
+            """``line`` with ``text`` written over it from ``start``, clipped to the row"""
+            text = text[:max(len(line) - start, 0)]
+            return line[:start] + text + line[start + len(text):]
+        
         for row_idx in range(rows - 1):
             line = star_grid[row_idx]
             
             if row_idx == 1:
-                for i, char in enumerate(header[:len(line)]):
-                    if i < len(line):
-                        line[i] = char
+                line = overlay(line, header)
             
             elif row_idx == 3:
-                start_pos = 2
-                for i, char in enumerate(timer_display):
-                    if start_pos + i < len(line):
-                        line[start_pos + i] = char
+                line = overlay(line, timer_display, 2)
             
             elif row_idx == 5:
-                start_pos = 2
                 bar_plain = f"[{'█' * filled}{'░' * (progress_bar_width - filled)}] {distance_covered:.0f}m"
-                for i, char in enumerate(bar_plain):
-                    if start_pos + i < len(line):
-                        line[start_pos + i] = char
+                line = overlay(line, bar_plain, 2)
             
             elif row_idx == 7:
-                start_pos = 2
                 status_plain = status.replace(COLORS['green'], '').replace(COLORS['solar'], '').replace(COLORS['red'], '').replace(COLORS[self.bg_color], '')
-                for i, char in enumerate(status_plain):
-                    if start_pos + i < len(line):
-                        line[start_pos + i] = char
+                line = overlay(line, status_plain, 2)
             
             elif row_idx >= 10 and row_idx < rows - 8:
                 chat_start = cols - 48
                 if chat_start > 50:
                     if row_idx == 10:
-                        chat_header = "💬 CHAT WITH WISDOM BOT"
-                        for i, char in enumerate(chat_header):
-                            if chat_start + i < len(line):
-                                line[chat_start + i] = char
+                        line = overlay(line, "💬 CHAT WITH WISDOM BOT", chat_start)
                     else:
                         msg_idx = row_idx - 11
                         if msg_idx < len(self.chat_messages):
-                            msg = self.chat_messages[-(msg_idx + 1)]
-                            display_msg = msg[:45]
-                            for i, char in enumerate(display_msg):
-                                if chat_start + i < len(line):
-                                    line[chat_start + i] = char
+                            line = overlay(line, self.chat_messages[-(msg_idx + 1)][:45], chat_start)
             
-            print(''.join(line))
+            print(line)
         
         controls = "SPACE=pause | B=back | Q=quit | C=chat | S=stats | O=color | N=new"
         print(controls[:cols] + COLORS['reset'])
         
         sys.stdout.flush()
     
-    def timer_loop(self):
+    def timer_loop(self, clock):
         """Background thread for timer"""
-        while self.running:
-            if not self.paused:
-                time.sleep(0.1)
-                self.elapsed += 0.1
-                self.star_offset = (self.star_offset + 1) % 100
-                
-                # Auto-save progress every 30 seconds
-                if int(self.elapsed) % 30 == 0 and self.elapsed > 0:
-                    distance_covered = (self.elapsed / 60) * METERS_PER_MINUTE
-                    self.add_session(self.user_name, distance_covered, int(self.elapsed), completed=False)
-                
-                if self.elapsed >= self.time_goal:
-                    self.timer_complete()
-                    break
-            else:
-                time.sleep(0.1)
+        while self.running and not clock.stopped:
+            # Sleeps until the next second boundary or the goal; blocks while paused
+            clock.wait()
+            if clock.stopped:
+                break
+            
+            # Checkpoint progress; the session itself is recorded once, at the end
+            self.save_checkpoint()
+            
+            if clock.done:
+                self.timer_complete()
+                break
     
     def timer_complete(self):
         """Handle timer completion"""
         self.running = False
+        self.clock.stop()
         distance_covered = (self.elapsed / 60) * METERS_PER_MINUTE
         
         self.add_session(self.user_name, distance_covered, int(self.elapsed), completed=True)
@@ -311,42 +317,54 @@ class PomodoroTimer:
         print(f"\n💡 Break Advice: {advice}")
         print("💧 Remember to drink water!")
         
-        wisdom = random.choice(QUOTES[random.choice(list(QUOTES.keys()))])
+        wisdom = self.quote_engine().store.sample()
         print(f"\n✨ Wisdom: {wisdom}")
         
         print("\nPress [N] for New Timer, [S] for Stats, [Q] to Quit")
         
         print("🚀 Mission Status Updated!")
     
-    def show_stats(self):
-        """Display statistics comparison"""
-        self.clear_screen()
-        print(f"\n{COLORS['solar']}📊 STATISTICS LEADERBOARD{COLORS['reset']}\n")
-        print("=" * 80)
-        
-        if not self.stats:
-            print("No statistics yet. Complete a session to see stats!")
-        else:
-            sorted_users = sorted(
-                self.stats.items(),
-                key=lambda x: x[1]['total_distance'],
-                reverse=True
-            )
-            
-            print(f"{'Rank':<6} {'Name':<20} {'Distance':<15} {'Time':<15} {'Sessions':<12} {'Completed':<10}")
-            print("-" * 80)
+    def show_stats(self, page_size=15):
+        """Display statistics comparison, one page of the leaderboard at a time"""
+        page = 0
+        while True:
+            self.clear_screen()
+            print(f"\n{COLORS['solar']}📊 STATISTICS LEADERBOARD{COLORS['reset']}\n")
+            print("=" * 80)
             
-            for rank, (name, data) in enumerate(sorted_users, 1):
-                hours = data['total_time'] // 3600
-                minutes = (data['total_time'] % 3600) // 60
-                time_str = f"{hours}h {minutes}m"
-                completed = data.get('completed_sessions', 0)
+            # Store queries pick up sessions other timers recorded since we last looked
+            total = self.store.user_count()
+            pages = max((total + page_size - 1) // page_size, 1)
+            if not total:
+                print("No statistics yet. Complete a session to see stats!")
+            else:
+                print(f"{'Rank':<6} {'Name':<20} {'Distance':<15} {'Time':<15} {'Sessions':<12} {'Completed':<10}")
+                print("-" * 80)
                 
-                color = COLORS['solar'] if rank == 1 else COLORS['green'] if rank <= 3 else ''
-                print(f"{color}{rank:<6} {name:<20} {data['total_distance']:.0f}m{'':<10} {time_str:<15} {len(data['sessions']):<12} {completed:<10}{COLORS['reset']}")
-        
-        print("\nPress ENTER to go back...")
-        input()
+                for rank, (name, data) in enumerate(self.store.leaderboard(page_size, page * page_size), page * page_size + 1):
+                    hours = int(data['total_time'] // 3600)
+                    minutes = int((data['total_time'] % 3600) // 60)
+                    time_str = f"{hours}h {minutes}m"
+                    completed = data.get('completed_sessions', 0)
+                    
+                    color = COLORS['solar'] if rank == 1 else COLORS['green'] if rank <= 3 else ''
+                    print(f"{color}{rank:<6} {name:<20} {data['total_distance']:.0f}m{'':<10} {time_str:<15} {data['session_count']:<12} {completed:<10}{COLORS['reset']}")
+                
+                mine = self.store.rank(self.user_name)
+                if mine:
+                    print(f"\n{self.user_name}: #{mine} of {total}")
+            
+            if pages == 1:
+                print("\nPress ENTER to go back...")
+            else:
+                print(f"\nPage {page + 1}/{pages} — N=next P=prev, ENTER to go back...")
+            choice = input().strip().lower()
+            if choice == 'n':
+                page = min(page + 1, pages - 1)
+            elif choice == 'p':
+                page = max(page - 1, 0)
+            else:
+                break
     
     def chat(self):
         """Interactive chat with bot"""
@@ -393,8 +411,11 @@ class PomodoroTimer:
         if self.timer_thread and self.timer_thread.is_alive():
             return
         
+        self.clock.stop()
+        self.clock = MissionClock(self.time_goal, elapsed=self.elapsed, now=self.now)
+        self.clock.start()
         self.running = True
-        self.timer_thread = threading.Thread(target=self.timer_loop, daemon=True)
+        self.timer_thread = threading.Thread(target=self.timer_loop, args=(self.clock,), daemon=True)
         self.timer_thread.start()
     
     
@@ -433,6 +454,21 @@ class PomodoroTimer:
             pass
 
 
+    def simulate(self, distance, sessions=1, every=0.0):
+        """Run whole sessions headless on a VirtualTime clock, one after another"""
+        for i in range(sessions):
+            started = self.now()
+            self.distance_goal = distance
+            self.time_goal = (distance / METERS_PER_MINUTE) * 60
+            self.elapsed = 0
+            # Marks-only clock: wakes at the goal instead of every second
+            self.clock = MissionClock(self.time_goal, now=self.now, tick=None)
+            self.clock.start()
+            self.running = True
+            self.timer_loop(self.clock)
+            if isinstance(self.now, VirtualTime) and i < sessions - 1:
+                self.now.advance(every - (self.now() - started))
+
     def run(self):
         """Main application loop"""
         self.clear_screen()
@@ -446,7 +482,8 @@ class PomodoroTimer:
         print(f"\n{COLORS['cosmic']}Welcome, {self.user_name}!{COLORS['reset']}")
         print(f"\n✨ {random.choice(QUOTES['iro'])}\n")
         
-        while True:
+        resumed = self.recover()
+        while not resumed:
             try:
                 distance = int(input(f"\n{COLORS['green']}Enter distance goal in meters (10m = 1min): {COLORS['reset']}"))
                 self.distance_goal = distance
@@ -489,6 +526,7 @@ class PomodoroTimer:
                         tty.setcbreak(sys.stdin.fileno())
                     elif key.lower() == 'n':
 
+                        self.clock.stop()
                         distance_covered = (self.elapsed / 60) * 10
                         self.add_session(self.user_name, distance_covered, int(self.elapsed), completed=False)
                         self.running = False
@@ -510,6 +548,18 @@ class PomodoroTimer:
                 self.run()
 
 if __name__ == "__main__":
+    import argparse
+    from datetime import timedelta
+    ap = argparse.ArgumentParser(description="Cosmic Pomodoro Timer")
+    ap.add_argument('--simulate', type=int, metavar='METERS', help="run sessions on a virtual clock")
+    ap.add_argument('--sessions', type=int, default=1)
+    ap.add_argument('--every', type=float, default=0.0, metavar='SECONDS', help="spacing between session starts")
+    args = ap.parse_args()
+    if args.simulate:
+        span = args.every * max(args.sessions - 1, 0) + (args.simulate / METERS_PER_MINUTE) * 60
+        app = PomodoroTimer(now=VirtualTime(epoch=datetime.now() - timedelta(seconds=span)))
+        app.simulate(args.simulate, args.sessions, args.every)
+        sys.exit()
     try:
         app = PomodoroTimer()
         app.run()
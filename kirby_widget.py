@@ -4,10 +4,16 @@ import os
 import sys
 import signal
 
+import stellar_bus
+from stellar_ranks import RANK_TIERS
+from stellar_shm import StatusSegment
+
 class PomodoroMonitor:
-    def __init__(self, watch_path='/tmp/pomodoro_widget.txt'):
+    def __init__(self, watch_path='/tmp/pomodoro_widget.txt', refresh_hz=4):
         self.path = watch_path
         self.active = True
+        self.interval = 1 / refresh_hz
+        self.segment = StatusSegment.attach()
         # Setup signal handling for clean exit
         signal.signal(signal.SIGINT, self.handle_exit)
         signal.signal(signal.SIGTERM, self.handle_exit)
@@ -19,11 +25,71 @@ class PomodoroMonitor:
         sys.stdout.flush()
         sys.exit(0)
 
+    def show(self, status_line):
+        # \r = Return to start of line
+        # \033[K = Clear from cursor to end of line (prevents ghosting)
+        timestamp = time.strftime("%H:%M:%S")
+        sys.stdout.write(f"\r\033[K[{timestamp}] {status_line}")
+        sys.stdout.flush()
+
+    def format_event(self, event):
+        """Turn a bus event into a one-line status"""
+        topic = event.get('topic')
+        if topic == 'tick':
+            m, s = divmod(int(event.get('elapsed', 0)), 60)
+            gm, gs = divmod(int(event.get('goal', 0)), 60)
+            state = "⏸ DRIFTING" if event.get('paused') else "▶ IN ORBIT"
+            return f"{event.get('user', '')} {m:02d}:{s:02d}/{gm:02d}:{gs:02d} | {event.get('distance', 0):.0f}m | {state}"
+        if topic == 'milestone':
+            return event.get('message', '')
+        if topic == 'complete':
+            return f"★ MISSION COMPLETE — {event.get('distance', 0):.0f}m | {event.get('rank', '')}"
+        return None
+
+    def format_status(self, status):
+        """One-line status from the shared-memory segment (sub-second fresh)"""
+        e = self.segment.live_elapsed(status)
+        m, s = divmod(e, 60)
+        gm, gs = divmod(int(status.goal), 60)
+        state = "⏸ DRIFTING" if status.paused else "▶ IN ORBIT"
+        rank = RANK_TIERS[min(max(status.rank, 0), len(RANK_TIERS) - 1)][1]
+        return f"{int(m):02d}:{s:04.1f}/{gm:02d}:{gs:02d} | {state} | {rank}"
+
+    def follow_segment(self):
+        """Read straight from mapped memory while the timer is running and its session is live"""
+        while self.active:
+            status = self.segment.read()
+            if not status.live:
+                return
+            self.show(self.format_status(status))
+            time.sleep(self.interval)
+
+    def follow_bus(self):
+        """Push-driven updates while a timer is publishing; returns when it stops"""
+        for event in stellar_bus.subscribe(['tick', 'milestone', 'complete']):
+            if not self.active:
+                break
+            line = self.format_event(event)
+            if line:
+                self.show(line)
+
     def draw(self):
         # Hide cursor for a professional CLI look
         sys.stdout.write("\033[?25l")
         
         while self.active:
+            if self.segment is None:
+                self.segment = StatusSegment.attach()
+            if self.segment and self.segment.read().live:
+                self.follow_segment()
+                continue
+
+            try:
+                self.follow_bus()
+            except OSError:
+                # No timer on the bus: fall back to the status file
+                pass
+
             try:
                 # Check for file existence and read
                 if os.path.exists(self.path):
@@ -35,12 +101,7 @@ class PomodoroMonitor:
                 else:
                     status_line = "INITIALIZING COSMIC LINK..."
 
-                # Format the output: 
-                # \r = Return to start of line
-                # \033[K = Clear from cursor to end of line (prevents ghosting)
-                timestamp = time.strftime("%H:%M:%S")
-                sys.stdout.write(f"\r\033[K[{timestamp}] {status_line}")
-                sys.stdout.flush()
+                self.show(status_line)
 
             except Exception as e:
                 sys.stdout.write(f"\r\033[K[Error] Accessing {self.path}...")
@@ -1,38 +1,195 @@
 #!/usr/bin/env python3
 import os
 import time
+import signal
+import struct
+import select
+import ctypes
+import ctypes.util
 import subprocess
 
+import stellar_bus
+
 SIGNAL_FILE = 'music_signal.txt'
 # Change this to your preferred player command (e.g., 'spotify', 'vlc', 'mpv')
 # Example: ['vlc', '--random', '/path/to/your/music/folder']
 MUSIC_COMMAND = ['mpv', '--shuffle', '~/Music/CosmicVibes/']
+POLL_INTERVAL = 2  # seconds, only used when inotify is unavailable
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_NONBLOCK    = 0o4000
+IN_CLOEXEC     = 0o2000000
+EVENT_HEADER   = struct.Struct('iIII')
+FILE_EVENTS    = IN_CLOSE_WRITE | IN_MOVED_TO   # signal file written, or replaced by rename
+SOCKET_EVENTS  = IN_CREATE                      # a timer (re)created the bus socket
+
+player = None
+
+
+def _inotify_fd(watches):
+    """Watch the folders holding each path of ``{path: mask}`` for that path's events only.
+
+    Returns an fd or None if unsupported.
+    """
+    # Directories, so atomic replace (write + rename) and socket creation are seen.
+    # One watch per folder: a second add_watch would replace the first mask.
+    folders = {}
+    for path, mask in watches.items():
+        folder = os.path.dirname(os.path.abspath(path))
+        folders[folder] = folders.get(folder, 0) | mask
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        for folder, mask in folders.items():
+            if libc.inotify_add_watch(fd, folder.encode(), mask) < 0:
+                os.close(fd)
+                return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _touched(buf, names):
+    """Yield each watched path an inotify event in ``buf`` names, if it is one of that path's events."""
+    i = 0
+    while i + EVENT_HEADER.size <= len(buf):
+        _, event, _, length = EVENT_HEADER.unpack_from(buf, i)
+        i += EVENT_HEADER.size
+        path, mask = names.get(buf[i:i + length].rstrip(b'\0'), (None, 0))
+        if event & mask:
+            yield path
+        i += length
+
+
+def _polled(paths, last):
+    """Yield each of ``paths`` whose mtime moved since the previous call (``last`` keeps them)."""
+    for p in paths:
+        try:
+            stamp = os.stat(p).st_mtime_ns
+        except FileNotFoundError:
+            stamp = None
+        if last.setdefault(p, stamp) != stamp:
+            last[p] = stamp
+            yield p
+
+
+def wait_for_change(watches, readers=()):
+    """Yield each path of ``{path: inotify mask}`` as it changes: inotify when possible, else polling.
+
+    The first value is None, meaning "check everything once". ``readers``
+    (a list the caller may change between values) are waited on as well,
+    and each one is yielded itself when it has data.
+    """
+    paths = list(watches)
+    fd = _inotify_fd(watches)
+    yield None
+    if fd is None:
+        print(f"⚠️  inotify unavailable, polling every {POLL_INTERVAL}s")
+    names = {os.path.basename(p).encode(): (p, m) for p, m in watches.items()}
+    last = {}
+    while True:
+        # Blocks with zero CPU until the kernel reports a watched event or a reader has data
+        waits = list(readers) if fd is None else [fd, *readers]
+        ready = select.select(waits, [], [], POLL_INTERVAL if fd is None else None)[0]
+        for r in ready:
+            if r is not fd:
+                yield r
+        if fd is None:
+            yield from _polled(paths, last)
+        elif fd in ready:
+            try:
+                buf = os.read(fd, 4096)
+            except BlockingIOError:
+                continue
+            yield from _touched(buf, names)
+
+
+def take_signal(path):
+    """Read and clear the pending signal ('' if none)."""
+    try:
+        with open(path, 'r+') as f:
+            content = f.read().strip()
+            if content:
+                # Clear the signal so it doesn't loop
+                f.seek(0)
+                f.truncate()
+            return content
+    except FileNotFoundError:
+        return ''
+
+
+def _stop_player():
+    global player
+    # A frozen (SIGSTOPped) player would sit on SIGTERM until continued
+    player.send_signal(signal.SIGCONT)
+    player.terminate()
+    player = None
+
+
+def handle(state):
+    """Apply one signal state to the player process."""
+    global player
+    alive = player is not None and player.poll() is None
+    if state == 'PLAY_NEXT':
+        print("🎵 Signal Received! Igniting Autoplay...")
+        if alive:
+            _stop_player()
+        # Execute music command
+        try:
+            player = subprocess.Popen([os.path.expanduser(a) for a in MUSIC_COMMAND])
+        except Exception as e:
+            player = None
+            print(f"❌ Failed to start music: {e}")
+    elif state == 'STOP' and alive:
+        print("⏹  Stopping music.")
+        _stop_player()
+    elif state == 'PAUSE' and alive:
+        print("⏸  Music frozen.")
+        player.send_signal(signal.SIGSTOP)
+    elif state == 'RESUME' and alive:
+        print("▶  Music resumed.")
+        player.send_signal(signal.SIGCONT)
+    # IDLE and unknown states need no action
+
+
+def attach_bus():
+    """[Subscription] to music states if a timer is publishing, else []."""
+    try:
+        return [stellar_bus.Subscription(['music'])]
+    except OSError:
+        return []
+
 
 def listen():
     print("🛰️  Satellite Listener Online... Waiting for Cosmic Kirbs' signal.")
-    
+
     # Ensure signal file exists so we don't error out
     if not os.path.exists(SIGNAL_FILE):
         open(SIGNAL_FILE, 'w').close()
 
-    while True:
-        if os.path.exists(SIGNAL_FILE):
-            with open(SIGNAL_FILE, 'r+') as f:
-                content = f.read().strip()
-                if content == 'PLAY_NEXT':
-                    print("🎵 Signal Received! Igniting Autoplay...")
-                    
-                    # Clear the signal so it doesn't loop
-                    f.seek(0)
-                    f.truncate()
-                    
-                    # Execute music command
-                    try:
-                        subprocess.Popen(MUSIC_COMMAND)
-                    except Exception as e:
-                        print(f"❌ Failed to start music: {e}")
-                        
-        time.sleep(2) # Check every 2 seconds to save CPU
+    # The signal file stays watched while the bus is followed: poyo only signals through the file
+    bus, feed = stellar_bus.BUS_PATH, []
+    for changed in wait_for_change({SIGNAL_FILE: FILE_EVENTS, bus: SOCKET_EVENTS}, feed):
+        if feed and changed is feed[0]:
+            events = feed[0].read()
+            if events is None:
+                # Timer gone, or replaced by one that already re-created the socket
+                feed[:] = attach_bus()
+                if not feed:
+                    print("🛰️  Bus closed, back to the signal file.")
+            for event in events or ():
+                handle(event.get('state', ''))
+            continue
+        if changed in (None, bus) and not feed:
+            feed[:] = attach_bus()
+        state = take_signal(SIGNAL_FILE)
+        if state:
+            handle(state)
 
 if __name__ == "__main__":
-    listen()
\ No newline at end of file
+    listen()
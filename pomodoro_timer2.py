@@ -6,16 +6,36 @@
 ╚══════════════════════════════════════════════════╝
 """
 
-import time, sys, os, threading, random, json, select
+import time, sys, os, threading, random, signal
 import termios, tty
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from stellar_checkpoint import ACTIVE, Checkpoint, checkpoint_path, recorded
+from stellar_clock import MissionClock, VirtualTime, wall_time
+from stellar_loop import EventLoop
+from stellar_quotes import QuoteEngine
+from stellar_ranks import get_rank, get_rank_index
+from stellar_metrics import INTERVAL, METRICS_PATH, MetricsExporter, metrics_file
+from stellar_profile import Profiler, TimedWriter
+from stellar_render import FrameMeter, FrameRenderer
+from stellar_starfield import Starfield
+from stellar_store import open_store, empty_user, streaks
+from stellar_bus import Bus
+from stellar_notify import Notifier
+from stellar_shm import StatusSegment
+
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
 DATA_FILE         = Path.home() / '.pomodoro_stats.json'
 SIGNAL_FILE       = Path('music_signal.txt')
 METERS_PER_MINUTE = 10
 USER_ID           = "avsn17"
+BUS               = Bus()   # pushes tick/milestone/complete/music events to subscribers
+NOTIFY            = Notifier()   # desktop-notification plugins, run on a worker thread
+STATS_BACKEND     = os.environ.get('STELLAR_BACKEND', 'journal')   # 'journal' | 'sqlite'
+BOARD_PAGE        = 15       # navigators per leaderboard page
+FRAME_RATE        = 10       # animation fps while in orbit; the starfield steps 10×/s
+FOCUS_EVENTS      = ('\033[?1004h', '\033[?1004l')   # terminal focus in/out reporting on/off
 
 # ─── COLORS ───────────────────────────────────────────────────────────────────
 C = {
@@ -69,17 +89,6 @@ CONSTELLATIONS = [
      "                  "],
 ]
 
-# ─── STAR RANK SYSTEM ─────────────────────────────────────────────────────────
-RANK_TIERS = [
-    (0,     "⚫ Brown Dwarf"),
-    (100,   "🟡 Yellow Dwarf"),
-    (500,   "🔵 Blue Giant"),
-    (1000,  "🔴 Red Supergiant"),
-    (2500,  "💥 Supernova"),
-    (5000,  "⚡ Neutron Star"),
-    (10000, "🌌 Singularity"),
-]
-
 MILESTONE_MSGS = {
     25:  "✦ First light detected",
     50:  "★ Halfway to the stars",
@@ -141,6 +150,17 @@ QUOTES = {
     ],
 }
 
+# Chat routing, earliest match wins; corpus files can add routes (stellar_quotes)
+CHAT_ROUTES = (
+    ('star',   ('star', 'cosmos', 'space', 'universe')),
+    ('iro',    ('iro', 'tea', 'uncle')),
+    ('bronte', ('bronte', 'emily', 'love', 'soul')),
+    ('kant',   ('kant', 'moral', 'reason')),
+    ('lyrics', ('song', 'music', 'lyric')),
+    ('heroic', ('hero', 'brave', 'courage')),
+    ('vibe',   ('vibe', 'cap', 'legend')),
+)
+
 BREAK_ADVICES = [
     "Stretch — your spine is not a black hole.",
     "Drink water. Stars are mostly hydrogen too. 💧",
@@ -153,157 +173,426 @@ BREAK_ADVICES = [
 ]
 
 # ─── HELPERS ──────────────────────────────────────────────────────────────────
-def get_rank(total_m: float) -> str:
-    rank = RANK_TIERS[0][1]
-    for threshold, label in RANK_TIERS:
-        if total_m >= threshold:
-            rank = label
-    return rank
-
 def clear():
     sys.stdout.write("\033[H\033[2J")
     sys.stdout.flush()
 
 def signal_music(state: str = "PLAY_NEXT"):
+    # Bus subscribers get the state pushed; the file is the fallback for old watchers
+    if BUS.subscribers('music') and BUS.publish('music', state=state):
+        return
     try:
         SIGNAL_FILE.write_text(state)
     except Exception:
         pass
 
-def _try_notify(fn_name: str, *args):
-    try:
-        import kirby_notify
-        getattr(kirby_notify, fn_name)(*args)
-    except Exception:
-        pass
-
 # ─── MAIN CLASS ───────────────────────────────────────────────────────────────
 class StellarTimer:
-    def __init__(self):
+    def __init__(self, data_file: Path = None, now=time.monotonic):
+        self.now             = now       # time source; a VirtualTime in --simulate
+        self.tick            = 1.0       # clock wake granularity, None for marks only
+        self.clock           = MissionClock(now=now)
         self.user_name       = USER_ID
         self.distance_goal   = 0
         self.time_goal       = 0.0
-        self.elapsed         = 0.0
         self.running         = False
-        self.paused          = False
         self.in_subscreen    = False
         self.chat_messages   = []
+        self.quotes          = None      # QuoteEngine, on first chat
+        self.data_file       = data_file or DATA_FILE
+        self.store           = open_store(STATS_BACKEND, self.data_file)
+        self.checkpoint      = None      # opened by run(); simulations and the daemon go without
+        self._unsaved        = []
         self.stats           = self._load_stats()
         self.star_offset     = 0
         self.frame_idx       = 0
         self.constellation   = random.choice(CONSTELLATIONS)
         self.bg_color        = 'gold'
         self.timer_thread    = None
+        self.loop            = None      # EventLoop while run() is on screen
+        self._clock_timer    = None
+        self._frame_timer    = None
+        self.renderer        = FrameRenderer()
+        self.meter           = FrameMeter()
+        self.fps             = FRAME_RATE
+        self.animations      = True
+        self.focused         = True      # from focus reports; unfocused runs like no animations
+        self.debug_overlay   = False
+        self.profiler        = None      # Profiler under --profile; see instrument()
+        self.metrics         = None      # MetricsExporter under --metrics; see export_metrics()
+        self.status_seg      = None
+        self.starfield       = Starfield()
         self.mood            = "Stellar"
         self.remind_interval = "10"
         self.session_count   = 0
         self.music_enabled   = True
+        self.notifications   = True
         self._status_banner  = ("", 0.0)
         self._old_termios    = None
         self._last_percent   = -1
 
+    # ── Clock-backed state ────────────────────────────────────────────────────
+    @property
+    def elapsed(self) -> float:
+        return self.clock.elapsed
+
+    @elapsed.setter
+    def elapsed(self, value: float):
+        self.clock.stop()
+        self.clock = MissionClock(self.time_goal, elapsed=value, now=self.now)
+
+    @property
+    def paused(self) -> bool:
+        return self.clock.is_held('user')
+
+    @paused.setter
+    def paused(self, value: bool):
+        if value:
+            self.clock.pause('user')
+        else:
+            self.clock.resume('user')
+        self._publish_tick()
+        self._checkpoint()
+
+    def _publish_tick(self):
+        e = self.elapsed
+        if self.status_seg:
+            self.status_seg.write(e, self.time_goal, self.paused,
+                                  get_rank_index(self._total_distance()), live=self.running)
+        BUS.publish('tick', user=self.user_name, elapsed=round(e, 2), goal=self.time_goal,
+                    paused=self.paused, distance=round((e / 60) * METERS_PER_MINUTE, 2))
+
     # ── Stats ─────────────────────────────────────────────────────────────────
     def _load_stats(self) -> dict:
-        if DATA_FILE.exists():
-            try:
-                return json.loads(DATA_FILE.read_text())
-            except Exception:
-                pass
-        return {}
+        try:
+            return self.store.load()
+        except Exception:
+            return {}
 
     def _save_stats(self):
-        DATA_FILE.write_text(json.dumps(self.stats, indent=2))
-
-    def _add_session(self, distance: float, duration: float, completed: bool = True):
-        u = self.user_name
+        # Journal the sessions recorded since the last save; never rewrites history
+        while self._unsaved:
+            u = self._unsaved[0][0]
+            self.store.append(*self._unsaved[0])
+            self._unsaved.pop(0)
+            # Totals now include sessions other timers appended to the same store
+            self.stats[u].update(self.store.totals(u))
+
+    def _add_session(self, distance: float, duration: float, completed: bool = True, user: str = None,
+                     date: str = None):
+        u = user or self.user_name
         if u not in self.stats:
-            self.stats[u] = {'sessions': [], 'total_distance': 0.0,
-                              'total_time': 0.0, 'completed_sessions': 0}
-        self.stats[u]['sessions'].append({
-            'date': datetime.now().isoformat(),
+            self.stats[u] = empty_user()
+        session = {
+            'date': date or wall_time(self.now).isoformat(),
             'distance': round(distance, 2),
             'duration': round(duration, 1),
             'completed': completed,
-        })
-        self.stats[u]['total_distance'] += distance
-        self.stats[u]['total_time']     += duration
+        }
+        if self.checkpoint:
+            self.checkpoint.finish(u, session)
+        self.stats[u]['sessions'].append(session)
+        self._unsaved.append((u, session))
+        self.stats[u]['total_distance'] += session['distance']
+        self.stats[u]['total_time']     += session['duration']
         if completed:
             self.stats[u]['completed_sessions'] += 1
             self.session_count += 1
+        t0 = time.perf_counter()
         self._save_stats()
+        if self.metrics is not None:
+            self.metrics.set('stellar_save_latency_seconds', time.perf_counter() - t0)
+            self._export_totals(u, self.stats[u])
+        if self.checkpoint:
+            self.checkpoint.clear()
 
     def _total_distance(self) -> float:
         return self.stats.get(self.user_name, {}).get('total_distance', 0.0)
 
+    # ── Checkpoint ────────────────────────────────────────────────────────────
+    def _checkpoint(self):
+        # One fixed-size in-place write; the history is only touched by _add_session
+        if self.checkpoint and self.running:
+            self.checkpoint.save(self.user_name, wall_time(self.now).isoformat(),
+                                 self.elapsed, self.time_goal, self.distance_goal)
+
+    def _recover(self) -> bool:
+        """Settle the session a crashed run left behind; True if it is resumed."""
+        if self.checkpoint is None:
+            self.checkpoint = Checkpoint.open(checkpoint_path(self.data_file, 'stellar'))
+        rec = self.checkpoint and self.checkpoint.load()
+        if rec is None:
+            return False
+        if rec.state == ACTIVE:
+            dist = (rec.elapsed / 60) * METERS_PER_MINUTE
+            try:
+                ch = input(f"\n  {C['amber']}Interrupted mission found: {dist:.0f} / {rec.distance:.0f} m "
+                           f"({rec.date[:16]}). Resume? (y/n): {C['reset']}").strip().lower()
+            except EOFError:
+                ch = 'n'
+            if ch == 'y':
+                self.distance_goal = int(rec.distance)
+                self.time_goal     = rec.goal
+                self.elapsed       = rec.elapsed
+                return True
+            self._add_session(dist, rec.elapsed, completed=False, user=rec.user, date=rec.date)
+        elif recorded(self.store, rec):
+            self.checkpoint.clear()
+        else:
+            self._add_session(rec.distance, rec.elapsed, rec.completed, user=rec.user, date=rec.date)
+        return False
+
     # ── Banner ────────────────────────────────────────────────────────────────
     def _set_banner(self, text: str, duration: float = 2.5):
         self._status_banner = (text, time.time() + duration)
+        if self.loop:
+            # Takes the banner down even if nothing else redraws (e.g. paused)
+            self.loop.call_later(duration, self._redraw)
 
     def _get_banner(self) -> str:
         text, expiry = self._status_banner
         return text if time.time() < expiry else ""
 
+    def _notify(self, fn_name: str, *args):
+        # Queued for the notifier thread; a slow plugin never delays a frame or _complete
+        if self.notifications:
+            NOTIFY.dispatch(fn_name, *args)
+
+    # ── Profiling ─────────────────────────────────────────────────────────────
+    def instrument(self, profiler: Profiler):
+        """Report hot-path timings to ``profiler`` (--profile).
+
+        frame.ui is a whole frame, including frame.starfield and the
+        stdout.write of its diff; tick.lateness is how far past its deadline
+        the clock woke. Without this the methods run unwrapped.
+        """
+        self.profiler = profiler
+        profiler.wrap(self, '_draw_starfield', 'frame.starfield')
+        profiler.wrap(self, '_draw_ui', 'frame.ui')
+        profiler.wrap(self, '_save_stats', 'stats.save')
+        self.renderer.out = TimedWriter(profiler, out=self.renderer.out)
+        NOTIFY.profiler   = profiler
+
+    def export_metrics(self, exporter: MetricsExporter):
+        """Keep ``exporter``'s focus counters and gauges current and start its writer."""
+        self.metrics = exporter
+        for u in self.stats:
+            self._export_totals(u, self.store.totals(u))
+        exporter.collect(self._live_metrics)
+        exporter.start()
+
+    def _export_totals(self, user: str, totals: dict):
+        done = totals['completed_sessions']
+        self.metrics.set('stellar_sessions_completed_total', done, navigator=user)
+        self.metrics.set('stellar_sessions_aborted_total', totals['session_count'] - done, navigator=user)
+        self.metrics.set('stellar_distance_meters_total', totals['total_distance'], navigator=user)
+        self.metrics.set('stellar_rank_tier', get_rank_index(totals['total_distance']), navigator=user)
+
+    def _live_metrics(self):
+        # Runs on the metrics writer thread; the clock reads under its own lock
+        if self.running and not self.clock.stopped:
+            yield 'stellar_session_elapsed_seconds', {'navigator': self.user_name}, self.clock.elapsed
+
+    def _tick_late(self, seconds: float):
+        if self.profiler is not None:
+            self.profiler.observe('tick.lateness', seconds)
+        if self.metrics is not None:
+            self.metrics.peak('stellar_tick_jitter_seconds', seconds)
+
     # ── Timer thread ──────────────────────────────────────────────────────────
-    def _timer_loop(self):
-        while self.running:
-            if not self.paused and not self.in_subscreen:
-                time.sleep(0.1)
-                self.elapsed     += 0.1
-                self.star_offset  = (self.star_offset + 1) % 300
-                self.frame_idx    = (self.frame_idx + 1) % len(STAR_FRAMES)
-                if self.elapsed >= self.time_goal:
-                    self._complete()
-                    break
-            else:
-                time.sleep(0.05)
+    def _timer_loop(self, clock: MissionClock):
+        # Sleeps until the next second / milestone / goal; pause blocks outright.
+        timed = self.profiler or self.metrics
+        while self.running and not clock.stopped:
+            due = clock.next_deadline() if timed and not clock.paused else None
+            e   = clock.wait()
+            if due is not None and e >= due:             # not woken early by pause/stop
+                self._tick_late(e - due)
+            if self._on_clock(clock):
+                break
 
-    def _start_timer(self):
+    def _on_clock(self, clock: MissionClock) -> bool:
+        """One clock wake: tick, checkpoint, milestones; True once complete."""
+        self._publish_tick()
+        self._checkpoint()
+        self._check_milestone(clock.elapsed)
+        if clock.done and not clock.stopped:
+            self._complete()
+            return True
+        return False
+
+    def _start_timer(self, threaded: bool = True):
+        """Start the clock; driven by a thread, or by ``self.loop`` when not threaded."""
+        marks             = [self.time_goal * p / 100 for p in sorted(MILESTONE_MSGS)]
+        self.clock.stop()
+        self.clock        = MissionClock(self.time_goal, marks, elapsed=self.elapsed,
+                                         now=self.now, tick=self.tick)
+        self.clock.start()
         self.running      = True
-        self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
-        self.timer_thread.start()
+        self.renderer.invalidate()
+        if threaded:
+            self.timer_thread = threading.Thread(target=self._timer_loop, args=(self.clock,), daemon=True)
+            self.timer_thread.start()
+
+    # ── Event loop (run) ──────────────────────────────────────────────────────
+    def _arm(self):
+        """Re-arm the next clock deadline and frame; nothing at all while paused."""
+        for t in (self._clock_timer, self._frame_timer):
+            if t:
+                t.cancel()
+        self._clock_timer = self._frame_timer = None
+        c = self.clock
+        if not self.running or c.stopped or c.paused:
+            return
+        e = c.elapsed
+        self._clock_timer = self.loop.call_later(c.next_deadline(e) - e, self._on_deadline)
+        if self._animating():
+            self._frame_timer = self.loop.call_later(1 / self.fps, self._on_frame)
+
+    def _animating(self) -> bool:
+        """Frames at ``fps``; otherwise only the clock's once-a-second change is drawn."""
+        return self.animations and self.focused and self.fps > 0
+
+    def _on_deadline(self):
+        if self.profiler or self.metrics:
+            self._tick_late(self.loop.now() - self._clock_timer.when)
+        self._clock_timer = None
+        if self._on_clock(self.clock):
+            self.loop.stop()
+            return
+        if not self._animating():
+            self._redraw()
+        if not self.clock.paused:
+            e = self.clock.elapsed
+            self._clock_timer = self.loop.call_later(self.clock.next_deadline(e) - e, self._on_deadline)
+
+    def _on_frame(self):
+        self._frame_timer = None
+        self._redraw()
+        if self.running and not self.clock.paused and self._animating():
+            self._frame_timer = self.loop.call_later(1 / self.fps, self._on_frame)
+
+    def _redraw(self):
+        if self.loop and not self.in_subscreen:
+            self._draw_ui()
+
+    def _on_resize(self):
+        self.renderer.invalidate()
+        self._redraw()
+
+    def _on_input(self):
+        try:
+            keys = os.read(sys.stdin.fileno(), 64).decode(errors='ignore')
+        except BlockingIOError:
+            return
+        if not keys:                     # stdin closed
+            self.loop.stop()
+            return
+        # Focus reports: ESC [ I (focused) / ESC [ O (in the background)
+        last = max(keys.rfind('\033[I'), keys.rfind('\033[O'))
+        if last >= 0:
+            self.focused = keys[last + 2] == 'I'
+            keys = keys.replace('\033[I', '').replace('\033[O', '')
+        for key in keys.lower():
+            if not self._on_key(key):
+                self.loop.stop()
+                return
+        self._arm()
+        self._redraw()
+
+    def _on_key(self, key: str) -> bool:
+        """Handle one key press; False when the session is over."""
+        if key == ' ':
+            self.paused = not self.paused
+
+        elif key in ('q', 'n'):
+            dist = (self.elapsed / 60) * METERS_PER_MINUTE
+            self.clock.stop()
+            self._add_session(dist, self.elapsed, completed=False)
+            self.running = False
+            return False
+
+        elif key == 'c':
+            self._chat()
+
+        elif key == 's':
+            self._show_stats()
+
+        elif key == 'd':
+            self.debug_overlay = not self.debug_overlay
+
+        elif key == 'a':
+            self._open_settings()
+
+        elif key == 'm':
+            self.music_enabled = not self.music_enabled
+            if self.music_enabled:
+                signal_music("PLAY_NEXT")
+                banner = "♪ MUSIC ON  — signal sent!"
+            else:
+                signal_music("STOP")
+                banner = "♪ MUSIC OFF — signal sent."
+            self._set_banner(banner, 2.5)
+            self.chat_messages.append(banner)
+
+        elif key == 'o':
+            self._enter_sub()
+            clear()
+            self._choose_color()
+            time.sleep(0.4)
+            self._exit_sub()
+        return True
 
     def _complete(self):
         self.running = False
+        self.clock.stop()
         dist = (self.elapsed / 60) * METERS_PER_MINUTE
         self._add_session(dist, self.elapsed, completed=True)
-        _try_notify('notify_session_end', dist, get_rank(self._total_distance()))
+        BUS.publish('complete', user=self.user_name, distance=round(dist, 2),
+                    rank=get_rank(self._total_distance()))
+        self._notify('notify_session_end', dist, get_rank(self._total_distance()))
         if self.music_enabled:
             signal_music("PLAY_NEXT")
 
+    def _check_milestone(self, elapsed: float):
+        percent = int((elapsed / self.time_goal) * 100) if self.time_goal > 0 else 0
+        if percent != self._last_percent and percent in MILESTONE_MSGS:
+            self._set_banner(MILESTONE_MSGS[percent], 3.0)
+            BUS.publish('milestone', user=self.user_name, percent=percent,
+                        message=MILESTONE_MSGS[percent])
+            self._notify('notify_milestone', percent)
+        self._last_percent = percent
+
     # ── UI ────────────────────────────────────────────────────────────────────
     def _draw_starfield(self, cols, rows):
-        chars = ['·', '∙', '•', '✦', '✧', '★', '*', '⋆']
-        grid  = [[' '] * cols for _ in range(rows)]
-        n     = (cols * rows) // 25
-        for _ in range(n):
-            x  = random.randint(0, cols - 1)
-            y  = random.randint(0, rows - 1)
-            nx = (x + self.star_offset) % cols
-            # Gold/silver mix
-            grid[y][nx] = random.choice(chars)
+        # Star layer is built once per size; a frame is one rotated slice per row
+        grid = self.starfield.rows(cols, rows, self.star_offset, self.star_offset // 5)
         # Shooting star across row 2
-        ss_x = (self.star_offset * 2) % max(cols - 10, 1)
-        for i, ch in enumerate(SHOOTING_STAR):
-            px = ss_x + i
-            if 0 <= px < cols:
-                grid[2][px] = ch
+        if rows > 2:
+            ss_x    = (self.star_offset * 2) % max(cols - 10, 1)
+            trail   = ''.join(SHOOTING_STAR)[:max(cols - ss_x, 0)]
+            grid[2] = grid[2][:ss_x] + trail + grid[2][ss_x + len(trail):]
         return grid
 
     def _draw_ui(self):
-        clear()
         try:
             cols, rows = os.get_terminal_size()
         except Exception:
             cols, rows = 80, 24
 
         col   = C[self.bg_color]
-        print(col, end='')
+
+        elapsed   = self.elapsed
+        # Animations off: a still starfield, so a frame only differs when the clock does
+        tick      = int(elapsed * 10) if self._animating() else 0
+        self.star_offset = tick % 300
+        self.frame_idx   = tick % len(STAR_FRAMES)
 
         grid      = self._draw_starfield(cols, rows - 1)
-        progress  = min(self.elapsed / self.time_goal, 1.0) if self.time_goal > 0 else 0.0
+        progress  = min(elapsed / self.time_goal, 1.0) if self.time_goal > 0 else 0.0
         bar_w     = max(cols - 32, 20)
-        dist_done = (self.elapsed / 60) * METERS_PER_MINUTE
-        mins, sec = divmod(int(self.elapsed), 60)
+        dist_done = (elapsed / 60) * METERS_PER_MINUTE
+        mins, sec = divmod(int(elapsed), 60)
         total_d   = self._total_distance()
         percent   = int(progress * 100)
 
@@ -327,11 +616,10 @@ class StellarTimer:
         banner     = self._get_banner()
 
         def _wr(r, text, start=0):
-            plain = text
-            for i, ch in enumerate(plain):
-                p = start + i
-                if 0 <= r < len(grid) and 0 <= p < len(grid[r]):
-                    grid[r][p] = ch
+            if 0 <= r < len(grid) and 0 <= start < len(grid[r]):
+                row     = grid[r]
+                text    = text[:len(row) - start]
+                grid[r] = row[:start] + text + row[start + len(text):]
 
         for r in range(rows - 1):
             if r == 1:   _wr(r, header[:cols - 25])
@@ -361,22 +649,33 @@ class StellarTimer:
                     if idx < len(visible):
                         _wr(r, visible[idx][:47], chat_col)
 
-            print(''.join(grid[r]))
-
         controls = ("[Space] Pause  [N] New  [S] Stars  [A] Config  "
                     "[C] Chat  [M] Music  [O] Color  [Q] Quit")
-        print(controls[:cols] + C['reset'])
-        sys.stdout.flush()
+        grid.append(controls[:cols])
+        self.meter.frame()
+        if self.debug_overlay:
+            mode = 'paused' if self.paused else f"{self.fps:g} fps" if self._animating() else '1/s'
+            _wr(0, f" {self.meter.fps():4.1f} fps  cpu {self.meter.cpu_percent():4.1f}%  [{mode}] ",
+                max(cols - 38, 0))
+        # Only the cells that moved since the last frame hit the terminal
+        self.renderer.render(grid, col, C['reset'])
 
     # ── Subscreen helpers ─────────────────────────────────────────────────────
     def _enter_sub(self):
         self.in_subscreen = True
+        self.clock.pause('sub')
+        if self.loop:
+            sys.stdout.write(FOCUS_EVENTS[1])
         if self._old_termios:
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self._old_termios)
 
     def _exit_sub(self):
         self.in_subscreen = False
+        self.renderer.invalidate()
+        self.clock.resume('sub')
         tty.setcbreak(sys.stdin.fileno())
+        if self.loop:
+            sys.stdout.write(FOCUS_EVENTS[0])
 
     # ── Chat ──────────────────────────────────────────────────────────────────
     def _chat(self):
@@ -400,42 +699,70 @@ class StellarTimer:
         self._exit_sub()
 
     def _bot_reply(self, msg: str) -> str:
-        ml = msg.lower()
-        if any(w in ml for w in ['star', 'cosmos', 'space', 'universe']): cat = 'star'
-        elif any(w in ml for w in ['iro', 'tea', 'uncle']):               cat = 'iro'
-        elif any(w in ml for w in ['bronte', 'emily', 'love', 'soul']):   cat = 'bronte'
-        elif any(w in ml for w in ['kant', 'moral', 'reason']):           cat = 'kant'
-        elif any(w in ml for w in ['song', 'music', 'lyric']):            cat = 'lyrics'
-        elif any(w in ml for w in ['hero', 'brave', 'courage']):          cat = 'heroic'
-        elif any(w in ml for w in ['vibe', 'cap', 'legend']):             cat = 'vibe'
-        else:                                                               cat = random.choice(list(QUOTES))
-        return random.choice(QUOTES[cat])
+        if self.quotes is None:
+            # Built on first chat: corpora can be large and most sessions never chat
+            self.quotes = QuoteEngine(QUOTES, CHAT_ROUTES)
+        return self.quotes.reply(msg)
 
     # ── Stats ─────────────────────────────────────────────────────────────────
     def _show_stats(self):
         self._enter_sub()
-        clear()
-        print(f"{C['gold']}{C['bold']}★ STELLAR LEADERBOARD ★{C['reset']}\n")
-        print("═" * 82)
-        if not self.stats:
-            print("No data yet. Complete a session to chart your stars!")
-        else:
-            print(f"{'#':<5} {'Navigator':<22} {'Distance':<12} {'Time':<12} {'Sessions':<10} {'Rank'}")
-            print("─" * 82)
-            for i, (name, d) in enumerate(sorted(
-                    self.stats.items(), key=lambda x: x[1].get('total_distance', 0), reverse=True), 1):
-                total_d   = d.get('total_distance', 0)
-                total_t   = d.get('total_time', 0)
-                sessions  = len(d.get('sessions', []))
-                completed = d.get('completed_sessions', 0)
-                h, m      = divmod(int(total_t) // 60, 60)
-                t_str     = f"{h}h {m:02d}m" if h else f"{m}m"
-                col       = C['gold'] if i == 1 else C['amber'] if i <= 3 else ''
-                print(f"{col}{i:<5} {name:<22} {total_d:.0f}m{'':<6} {t_str:<12} {sessions}/{completed}{'':<4} {get_rank(total_d)}{C['reset']}")
-        print("\nPress ENTER to return to orbit...")
-        input()
+        page = 0
+        while True:
+            clear()
+            print(f"{C['gold']}{C['bold']}★ STELLAR LEADERBOARD ★{C['reset']}\n")
+            print("═" * 82)
+            # One page from the ordered index; nothing is sorted here
+            total = self.store.user_count()
+            pages = max((total + BOARD_PAGE - 1) // BOARD_PAGE, 1)
+            page  = min(page, pages - 1)
+            board = self.store.leaderboard(BOARD_PAGE, page * BOARD_PAGE)
+            if not board:
+                print("No data yet. Complete a session to chart your stars!")
+            else:
+                print(f"{'#':<5} {'Navigator':<22} {'Distance':<12} {'Time':<12} {'Sessions':<10} {'Rank'}")
+                print("─" * 82)
+                for i, (name, d) in enumerate(board, page * BOARD_PAGE + 1):
+                    total_d   = d.get('total_distance', 0)
+                    total_t   = d.get('total_time', 0)
+                    sessions  = d.get('session_count', 0)
+                    completed = d.get('completed_sessions', 0)
+                    h, m      = divmod(int(total_t) // 60, 60)
+                    t_str     = f"{h}h {m:02d}m" if h else f"{m}m"
+                    col       = C['gold'] if i == 1 else C['amber'] if i <= 3 else C['cyan'] if name == self.user_name else ''
+                    print(f"{col}{i:<5} {name:<22} {total_d:.0f}m{'':<6} {t_str:<12} {sessions}/{completed}{'':<4} {get_rank(total_d)}{C['reset']}")
+                print("─" * 82)
+                mine = self.store.rank(self.user_name)
+                if mine:
+                    print(f"{C['dim']}You are #{mine} of {total}.{C['reset']}")
+                print(self._period_summary())
+            if pages == 1:
+                print("\nPress ENTER to return to orbit...")
+            else:
+                print(f"\nPage {page + 1}/{pages} — [N]ext [P]rev [Y]ours, ENTER to return to orbit...")
+            ch = input().strip().lower()
+            if ch == 'n':
+                page = min(page + 1, pages - 1)
+            elif ch == 'p':
+                page = max(page - 1, 0)
+            elif ch == 'y' and self.store.rank(self.user_name):
+                page = (self.store.rank(self.user_name) - 1) // BOARD_PAGE
+            else:
+                break
         self._exit_sub()
 
+    def _period_summary(self) -> str:
+        # Rollup buckets, not sessions: O(days) however long the history is
+        today     = wall_time(self.now).date()
+        y, w, _   = today.isocalendar()
+        week      = self.store.rollup(self.user_name, 'week', f"{y}-W{w:02d}", f"{y}-W{w:02d}")
+        month     = self.store.rollup(self.user_name, 'month', today.isoformat()[:7], today.isoformat()[:7])
+        cur, best = streaks(self.store.rollup(self.user_name, 'day'), today)
+        week_m    = week[0][1]['distance'] if week else 0
+        month_m   = month[0][1]['distance'] if month else 0
+        return (f"{C['cyan']}{self.user_name}: {week_m:.0f}m this week · {month_m:.0f}m this month"
+                f" · streak {cur}d (best {best}d){C['reset']}")
+
     # ── Settings ──────────────────────────────────────────────────────────────
     def _open_settings(self):
         self._enter_sub()
@@ -446,7 +773,11 @@ class StellarTimer:
         print(f"  [3] Reset Session Count ({self.session_count})")
         print(f"  [4] Toggle Music        ({'ON ♪' if self.music_enabled else 'OFF ♪'})")
         print(f"  [5] Change Star Color")
-        print(f"  [6] Back\n")
+        print(f"  [6] Animations          ({f'ON, {self.fps:g} fps' if self.animations else 'OFF'})")
+        print(f"  [7] Notifications     ({'ON' if self.notifications else 'OFF'})")
+        for line in NOTIFY.readout():
+            print(f"      {C['dim']}{line}{C['reset']}")
+        print(f"  [8] Back\n")
         try:
             ch = input(f"{C['cyan']}Select: {C['reset']}").strip()
             if ch == '1':
@@ -467,6 +798,12 @@ class StellarTimer:
                 print(f"  Music: {'ON ♪' if self.music_enabled else 'OFF'}")
             elif ch == '5':
                 self._choose_color()
+            elif ch == '6':
+                self.animations = not self.animations
+                print(f"  ✦ Animations {'ON' if self.animations else 'OFF — redraws once a second'}.")
+            elif ch == '7':
+                self.notifications = not self.notifications
+                print(f"  ✦ Notifications {'ON' if self.notifications else 'OFF'}.")
         except (EOFError, KeyboardInterrupt):
             pass
         time.sleep(0.6)
@@ -512,7 +849,7 @@ class StellarTimer:
         print(f"  {C['amber']}Rank: {rank}{C['reset']}")
         print(f"\n  ✦ Break: {random.choice(BREAK_ADVICES)}")
         print(f"\n  ★ {random.choice(QUOTES['star'])}")
-        _try_notify('notify_session_end', dist, rank)
+        self._notify('notify_session_end', dist, rank)
         if self.music_enabled:
             signal_music("PLAY_NEXT")
             print(f"\n  ♪ Music signal sent.")
@@ -534,11 +871,43 @@ class StellarTimer:
         else:
             print(f"\n  {C['gold']}✦ Safe travels, {self.user_name}. Ad astra. 🌌{C['reset']}\n")
 
+    # ── Simulation ────────────────────────────────────────────────────────────
+    def simulate(self, distance: int, sessions: int = 1, every: float = 0.0, fps: float = 0.0) -> list:
+        """Run whole sessions on ``self.now`` (a VirtualTime) without a keyboard.
+
+        Milestones, completion, ``_add_session`` and music signalling all run
+        as in a real session. ``every`` spaces session starts in virtual
+        seconds; ``fps`` > 0 draws the UI at that real frame rate, otherwise
+        nothing is rendered and the clock only wakes at milestones.
+        """
+        self.tick = 1.0 if fps else None
+        results   = []
+        for i in range(sessions):
+            started = self.now()
+            self.distance_goal = distance
+            self.time_goal     = (distance / METERS_PER_MINUTE) * 60
+            self.elapsed       = 0.0
+            self._last_percent = -1
+            self._start_timer()
+            while self.timer_thread.is_alive():
+                if fps:
+                    self._draw_ui()
+                self.timer_thread.join(1 / fps if fps else None)
+            results.append({'date': self.stats[self.user_name]['sessions'][-1]['date'],
+                            'distance': round((self.elapsed / 60) * METERS_PER_MINUTE, 2),
+                            'rank': get_rank(self._total_distance())})
+            if isinstance(self.now, VirtualTime) and i < sessions - 1:
+                self.now.advance(every - (self.now() - started))
+        return results
+
     # ── Main loop ─────────────────────────────────────────────────────────────
     def run(self):
+        if self.notifications:
+            NOTIFY.start()               # plugins import on the worker during the splash
         self._splash()
 
-        while True:
+        resumed = self._recover()
+        while not resumed:
             try:
                 raw  = input(f"\n  {C['green']}Enter distance goal in meters (10 m = 1 min): {C['reset']}").strip()
                 dist = int(raw)
@@ -551,74 +920,39 @@ class StellarTimer:
             except ValueError:
                 print(f"  {C['red']}Please enter a positive integer.{C['reset']}")
 
-        self._start_timer()
-        _try_notify('notify_session_start', self.distance_goal)
+        if self.status_seg is None:
+            try:
+                # None while another timer publishes; this one then skips the segment
+                self.status_seg = StatusSegment.create()
+            except OSError:
+                pass
+        # One selectors loop: keys, clock deadlines, frames, SIGWINCH and the bus socket
+        self.loop = EventLoop()
+        self._start_timer(threaded=False)
+        self._publish_tick()
+        BUS.start(self.loop)
+        self._notify('notify_session_start', self.distance_goal)
         self._old_termios = termios.tcgetattr(sys.stdin)
 
         try:
             tty.setcbreak(sys.stdin.fileno())
-
-            while self.running or self.paused:
-                if not self.in_subscreen:
-                    percent = int((self.elapsed / self.time_goal) * 100) if self.time_goal > 0 else 0
-                    if percent != self._last_percent and percent in MILESTONE_MSGS:
-                        self._set_banner(MILESTONE_MSGS[percent], 3.0)
-                        _try_notify('notify_milestone', percent)
-                    self._last_percent = percent
-                    self._draw_ui()
-
-                if select.select([sys.stdin], [], [], 0.08)[0]:
-                    key = sys.stdin.read(1).lower()
-
-                    if key == ' ':
-                        self.paused = not self.paused
-
-                    elif key == 'q':
-                        dist = (self.elapsed / 60) * METERS_PER_MINUTE
-                        self._add_session(dist, self.elapsed, completed=False)
-                        self.running = False
-                        break
-
-                    elif key == 'n':
-                        dist = (self.elapsed / 60) * METERS_PER_MINUTE
-                        self._add_session(dist, self.elapsed, completed=False)
-                        self.running = False
-                        break
-
-                    elif key == 'c':
-                        self._chat()
-
-                    elif key == 's':
-                        self._show_stats()
-
-                    elif key == 'a':
-                        self._open_settings()
-
-                    elif key == 'm':
-                        self.music_enabled = not self.music_enabled
-                        if self.music_enabled:
-                            signal_music("PLAY_NEXT")
-                            banner = "♪ MUSIC ON  — signal sent!"
-                        else:
-                            signal_music("STOP")
-                            banner = "♪ MUSIC OFF — signal sent."
-                        self._set_banner(banner, 2.5)
-                        self.chat_messages.append(banner)
-
-                    elif key == 'o':
-                        self._enter_sub()
-                        clear()
-                        self._choose_color()
-                        time.sleep(0.4)
-                        self._exit_sub()
-
-                time.sleep(0.05)
+            sys.stdout.write(FOCUS_EVENTS[0])
+            self.loop.add_reader(sys.stdin, self._on_input)
+            self.loop.add_signal(signal.SIGWINCH, self._on_resize)
+            self._arm()
+            self._draw_ui()
+            self.loop.run()
 
         finally:
+            self.loop.close()
+            self.loop = self._clock_timer = self._frame_timer = None
+            sys.stdout.write(FOCUS_EVENTS[1])
             try:
                 termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self._old_termios)
             except Exception:
                 pass
+            if self.status_seg:
+                self.status_seg.close_session()
             print(C['reset'])
 
         if self.elapsed >= self.time_goal > 0:
@@ -628,8 +962,84 @@ class StellarTimer:
 
 
 # ─── ENTRY POINT ──────────────────────────────────────────────────────────────
+def _simulate_main(args, profiler: Profiler = None, exporter: MetricsExporter = None):
+    """--simulate: replay sessions on a virtual clock and print one line each."""
+    span   = args.every * max(args.sessions - 1, 0) + (args.simulate / METERS_PER_MINUTE) * 60
+    now    = VirtualTime(args.speed, datetime.now() - timedelta(seconds=span))
+    timer  = StellarTimer(args.data, now=now)
+    timer.user_name     = args.user
+    timer.notifications = False
+    timer.music_enabled = args.music
+    if profiler:
+        timer.instrument(profiler)
+    if exporter:
+        timer.export_metrics(exporter)
+    t0 = time.perf_counter()
+    for i, r in enumerate(timer.simulate(args.simulate, args.sessions, args.every, args.fps), 1):
+        if not args.fps and (args.sessions <= 20 or i % max(args.sessions // 20, 1) == 0):
+            print(f"✦ #{i:<5} {r['date'][:16]}  {r['distance']:>7.0f} m  {r['rank']}")
+    wall = time.perf_counter() - t0
+    if args.fps:
+        print(C['reset'])
+    print(f"✦ {args.sessions} session(s), {now() / 3600:.1f} virtual hours in {wall:.2f}s "
+          f"→ {args.data or DATA_FILE}")
+
+
 if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Stellar focus timer")
+    ap.add_argument('--simulate', type=int, metavar='METERS',
+                    help="run sessions of this distance on a virtual clock, no keyboard")
+    ap.add_argument('--sessions', type=int, default=1, help="simulated sessions to run")
+    ap.add_argument('--every', type=float, default=0.0, metavar='SECONDS',
+                    help="virtual spacing between session starts (e.g. 10800 = every 3 h)")
+    ap.add_argument('--speed', type=float, default=0.0,
+                    help="virtual seconds per real second; 0 jumps deadline to deadline")
+    ap.add_argument('--fps', type=float, default=0.0,
+                    help=f"UI frame rate while animating (default {FRAME_RATE}); with --simulate needs --speed")
+    ap.add_argument('--no-anim', action='store_true', help="no animations: redraw once a second, when the clock changes")
+    ap.add_argument('--debug', action='store_true', help="show achieved fps and CPU use (toggle with D)")
+    ap.add_argument('--data', type=Path, help="stats file to write (default: ~/.pomodoro_stats.json)")
+    ap.add_argument('--user', default=USER_ID)
+    ap.add_argument('--music', action='store_true', help="send music signals on completion")
+    ap.add_argument('--profile', action='store_true',
+                    help="time frames, stdout writes, clock ticks and saves; report at exit")
+    ap.add_argument('--profile-out', metavar='FILE',
+                    help="also stream every sample to FILE as JSON lines (implies --profile)")
+    ap.add_argument('--metrics', metavar='PATH', default=METRICS_PATH,
+                    help="write Prometheus textfile metrics to PATH (a file, or a directory for "
+                         "stellar_timer.prom); default $STELLAR_METRICS")
+    ap.add_argument('--metrics-interval', type=float, default=INTERVAL, metavar='SECONDS',
+                    help="write the metrics file at most this often")
+    args = ap.parse_args()
+    profiler = Profiler(args.profile_out) if args.profile or args.profile_out else None
+    exporter = (MetricsExporter(metrics_file(args.metrics, 'stellar_timer.prom'), args.metrics_interval)
+                if args.metrics else None)
+    if args.simulate:
+        if args.fps and not args.speed:
+            ap.error("--fps needs --speed (step mode finishes before a frame is drawn)")
+        try:
+            _simulate_main(args, profiler, exporter)
+        finally:
+            if profiler:
+                profiler.close()
+            if exporter:
+                exporter.close()
+        sys.exit()
     try:
-        StellarTimer().run()
+        timer = StellarTimer()
+        timer.fps           = args.fps or FRAME_RATE
+        timer.animations    = not args.no_anim
+        timer.debug_overlay = args.debug
+        if profiler:
+            timer.instrument(profiler)
+        if exporter:
+            timer.export_metrics(exporter)
+        timer.run()
     except KeyboardInterrupt:
-        print(f"\n\n{C['gold']}✦ Mission aborted. Ad astra, {USER_ID}. 🌌{C['reset']}\n")
\ No newline at end of file
+        print(f"\n\n{C['gold']}✦ Mission aborted. Ad astra, {USER_ID}. 🌌{C['reset']}\n")
+    finally:
+        if profiler:
+            profiler.close()
+        if exporter:
+            exporter.close()
\ No newline at end of file
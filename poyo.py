@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
-import time, os, sys, threading, json, termios, tty, select, random
+import time, os, sys, signal, termios, tty
 from datetime import datetime
 from pathlib import Path
 
+from stellar_clock import MissionClock, VirtualTime, wall_time
+from stellar_loop import EventLoop
+from stellar_quotes import QuoteEngine
+from stellar_store import open_store
+
 # --- Mission Config (2026) ---
 USER_ID = "Cosmic Kirbs"
 STATS_PATH = Path.home() / '.pomodoro_stats.json'
+STATS_BACKEND = os.environ.get('STELLAR_BACKEND', 'journal')  # same store as pomodoro_timer2
 METERS_PER_MINUTE = 10
 SIGNAL_FILE = 'music_signal.txt'
 
@@ -26,41 +32,41 @@ QUOTES = {
 }
 
 class CosmicTimer:
-    def __init__(self):
+    def __init__(self, now=time.monotonic):
         self.dist_goal = 0
         self.time_goal_s = 0
-        self.elapsed = 0
+        self.now = now  # time source; a VirtualTime in --simulate
+        self.clock = MissionClock(now=now)
+        self.autoplay = True
         self.running = False
-        self.paused = False
         self.in_chat = False
-        self.stats = self.load_stats()
-        self.old_settings = termios.tcgetattr(sys.stdin)
+        self.loop = None
+        self.tick_timer = None
+        self.quotes = None  # QuoteEngine, loaded on first chat
+        self.store = open_store(STATS_BACKEND, STATS_PATH)  # nothing read until a mission is logged
+        self.old_settings = termios.tcgetattr(sys.stdin) if sys.stdin.isatty() else None
 
-    def load_stats(self):
-        if STATS_PATH.exists():
-            try:
-                with open(STATS_PATH, 'r') as f:
-                    data = json.load(f)
-                    return data if isinstance(data, dict) else {}
-            except: return {}
-        return {}
+    @property
+    def elapsed(self):
+        return self.clock.elapsed
+
+    @property
+    def paused(self):
+        return self.clock.is_held('user')
 
     def log_mission(self):
         dist = (self.elapsed / 60) * METERS_PER_MINUTE
-        if USER_ID not in self.stats:
-            self.stats[USER_ID] = {'total_m': 0, 'sessions': 0, 'history': []}
-        
-        self.stats[USER_ID]['total_m'] += dist
-        self.stats[USER_ID]['sessions'] += 1
-        self.stats[USER_ID]['history'].append({
-            'ts': datetime.now().isoformat(), 
-            'm': round(dist, 2)
+        # A session like the other timers record, so every leaderboard counts it
+        self.store.append(USER_ID, {
+            'date': wall_time(self.now).isoformat(),
+            'distance': round(dist, 2),
+            'duration': round(self.elapsed, 1),
+            'completed': self.clock.done,
         })
-        
-        with open(STATS_PATH, 'w') as f:
-            json.dump(self.stats, f, indent=2)
             
         # Trigger Music Autoplay Signal
+        if not self.autoplay:
+            return
         try:
             with open(SIGNAL_FILE, 'w') as f:
                 f.write('PLAY_NEXT')
@@ -73,6 +79,9 @@ class CosmicTimer:
 
     def chat_mode(self):
         self.in_chat = True
+        self.clock.pause('chat')
+        if self.quotes is None:
+            self.quotes = QuoteEngine(QUOTES, ())
         # Reset terminal to normal mode for input()
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
         self.clear()
@@ -83,8 +92,8 @@ class CosmicTimer:
             try:
                 cmd = input(f"{COLORS['c']}{USER_ID} > {COLORS['r']}").lower().strip()
                 if cmd == 'back': break
-                if cmd in QUOTES:
-                    print(f"{COLORS['s']}Reflect: {random.choice(QUOTES[cmd])}{COLORS['r']}\n")
+                if cmd in self.quotes.store:
+                    print(f"{COLORS['s']}Reflect: {self.quotes.store.sample(cmd)}{COLORS['r']}\n")
                 else:
                     print(f"{COLORS['v']}Unknown catalog entry.{COLORS['r']}")
             except EOFError: break
@@ -92,6 +101,7 @@ class CosmicTimer:
         # Go back to raw mode for the timer loop
         tty.setcbreak(sys.stdin.fileno())
         self.in_chat = False
+        self.clock.resume('chat')
 
     def run(self):
         self.clear()
@@ -100,40 +110,33 @@ class CosmicTimer:
         try:
             val = input(f"\n{COLORS['g']}Enter distance goal in meters: {COLORS['r']}")
             self.dist_goal = int(val)
+            if self.dist_goal <= 0:
+                raise ValueError(val)  # a 0 m goal is never done
             self.time_goal_s = (self.dist_goal / METERS_PER_MINUTE) * 60
+            self.clock = MissionClock(self.time_goal_s, now=self.now)
             self.running = True
         except (ValueError, KeyboardInterrupt):
             print("\nMission aborted.")
             return
 
-        # Start input listener thread
-        threading.Thread(target=self.input_listener, daemon=True).start()
+        # Keys, the next whole second / goal and SIGWINCH all wake one selectors loop
+        self.clock.start()
+        self.loop = EventLoop()
+        tty.setcbreak(sys.stdin.fileno())
 
         try:
-            while self.running and self.elapsed < self.time_goal_s:
-                if not self.in_chat:
-                    self.clear()
-                    m, s = divmod(int(self.elapsed), 60)
-                    cur_dist = (self.elapsed / 60) * METERS_PER_MINUTE
-                    
-                    status = f"{COLORS['v']}[PAUSED]{COLORS['r']}" if self.paused else f"{COLORS['g']}[ACTIVE]{COLORS['r']}"
-                    
-                    print(f"{COLORS['c']}🚀 MISSION | PILOT: {USER_ID} {status}{COLORS['r']}")
-                    print(f"{COLORS['s']}TIME: {m:02d}:{s:02d} | DIST: {cur_dist:.1f} / {self.dist_goal}m{COLORS['r']}")
-                    
-                    # Kirby animation
-                    pos = (int(self.elapsed) % 20)
-                    print(f"\n{' ' * pos}{COLORS['p']}<( \" )> *poyo*{COLORS['r']}")
-                    
-                    print(f"\n{COLORS['v']}Controls: [Space] Pause | [C] Chat | [Q] Log & Autoplay{COLORS['r']}")
-                
-                if not self.paused and not self.in_chat:
-                    self.elapsed += 1
-                time.sleep(1)
+            self.loop.add_reader(sys.stdin, self.on_input)
+            self.loop.add_signal(signal.SIGWINCH, self.draw)
+            self.draw()
+            self.arm()
+            self.loop.run()
         except KeyboardInterrupt:
             pass
         finally:
+            self.loop.close()
+            self.loop = self.tick_timer = None
             self.running = False
+            self.clock.stop()
             self.log_mission()
             # Final terminal reset
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
@@ -141,19 +144,83 @@ class CosmicTimer:
         print(f"\n{COLORS['g']}✨ MISSION COMPLETE. Autoplay triggered for {USER_ID}.{COLORS['r']}")
         print(f"{COLORS['c']}Logged {round((self.elapsed/60)*METERS_PER_MINUTE, 2)}m to history.{COLORS['r']}\n")
 
-    def input_listener(self):
-        fd = sys.stdin.fileno()
-        tty.setcbreak(fd)
-        while self.running:
-            if not self.in_chat:
-                dr, dw, de = select.select([sys.stdin], [], [], 0.1)
-                if dr:
-                    k = sys.stdin.read(1).lower()
-                    if k == ' ': self.paused = not self.paused
-                    elif k == 'c': self.chat_mode()
-                    elif k == 'q': 
-                        self.running = False
-                        break
+    def simulate(self, dist, sessions=1, every=0.0):
+        """Fly whole missions on a VirtualTime clock: no screen, no keyboard."""
+        for i in range(sessions):
+            started = self.now()
+            self.dist_goal = dist
+            self.time_goal_s = (dist / METERS_PER_MINUTE) * 60
+            self.clock = MissionClock(self.time_goal_s, now=self.now, tick=None)
+            self.clock.start()
+            while not self.clock.done:
+                self.clock.wait()
+            self.clock.stop()
+            self.log_mission()
+            if isinstance(self.now, VirtualTime) and i < sessions - 1:
+                self.now.advance(every - (self.now() - started))
+
+    def draw(self):
+        if self.in_chat:
+            return
+        self.clear()
+        m, s = divmod(int(self.elapsed), 60)
+        cur_dist = (self.elapsed / 60) * METERS_PER_MINUTE
+        
+        status = f"{COLORS['v']}[PAUSED]{COLORS['r']}" if self.paused else f"{COLORS['g']}[ACTIVE]{COLORS['r']}"
+        
+        print(f"{COLORS['c']}🚀 MISSION | PILOT: {USER_ID} {status}{COLORS['r']}")
+        print(f"{COLORS['s']}TIME: {m:02d}:{s:02d} | DIST: {cur_dist:.1f} / {self.dist_goal}m{COLORS['r']}")
+        
+        # Kirby animation
+        pos = (int(self.elapsed) % 20)
+        print(f"\n{' ' * pos}{COLORS['p']}<( \" )> *poyo*{COLORS['r']}")
+        
+        print(f"\n{COLORS['v']}Controls: [Space] Pause | [C] Chat | [Q] Log & Autoplay{COLORS['r']}")
+
+    def arm(self):
+        # Next whole second or the goal; nothing is scheduled while paused
+        if self.tick_timer:
+            self.tick_timer.cancel()
+        self.tick_timer = None
+        if self.running and not self.clock.paused and not self.clock.stopped:
+            e = self.elapsed
+            self.tick_timer = self.loop.call_later(self.clock.next_deadline(e) - e, self.on_tick)
+
+    def on_tick(self):
+        self.tick_timer = None
+        if self.clock.done:
+            self.loop.stop()
+            return
+        self.draw()
+        self.arm()
+
+    def on_input(self):
+        keys = os.read(sys.stdin.fileno(), 64).decode(errors='ignore').lower()
+        for k in keys or 'q':            # EOF on stdin ends the mission like [Q]
+            if k == ' ': self.clock.toggle('user')
+            elif k == 'c': self.chat_mode()
+            elif k == 'q':
+                self.running = False
+                self.clock.stop()
+                self.loop.stop()
+                return
+        self.draw()
+        self.arm()
 
 if __name__ == "__main__":
-    CosmicTimer().run()
\ No newline at end of file
+    import argparse
+    from datetime import timedelta
+    ap = argparse.ArgumentParser(description="Cosmic Pomodoro (poyo)")
+    ap.add_argument('--simulate', type=int, metavar='METERS', help="log missions flown on a virtual clock")
+    ap.add_argument('--sessions', type=int, default=1)
+    ap.add_argument('--every', type=float, default=0.0, metavar='SECONDS', help="spacing between mission starts")
+    ap.add_argument('--music', action='store_true', help="write the autoplay signal after each mission")
+    args = ap.parse_args()
+    if args.simulate:
+        span = args.every * max(args.sessions - 1, 0) + (args.simulate / METERS_PER_MINUTE) * 60
+        timer = CosmicTimer(now=VirtualTime(epoch=datetime.now() - timedelta(seconds=span)))
+        timer.autoplay = args.music
+        timer.simulate(args.simulate, args.sessions, args.every)
+        print(f"{COLORS['g']}✨ {args.sessions} mission(s) logged for {USER_ID}.{COLORS['r']}")
+    else:
+        CosmicTimer().run()
\ No newline at end of file
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Local pub/sub bus over a Unix domain socket.
+
+The running timer owns the socket and pushes newline-delimited JSON
+events (``tick``, ``milestone``, ``complete``, ``music``) to every
+subscriber that asked for the topic. Subscribers connect, send one line
+``{"topics": [...]}`` and then just read. Nothing is polled; a slow or
+dead subscriber is dropped rather than allowed to stall the publisher.
+The socket is served by a thread, or by the caller's ``EventLoop`` when
+``start()`` is given one.
+
+    python3 stellar_bus.py [topic ...]   — print events as they arrive
+"""
+
+import atexit
+import json
+import os
+import socket
+import sys
+import threading
+
+BUS_PATH = os.environ.get('STELLAR_BUS', '/tmp/stellar_bus.sock')
+
+
+class Bus:
+    """Publisher side: accepts subscribers and fans events out to them."""
+
+    def __init__(self, path: str = BUS_PATH):
+        self.path    = path
+        self.subs    = []          # [(conn, topics)]
+        self._lock   = threading.Lock()
+        self._server = None
+        self._loop   = None
+
+    @property
+    def live(self) -> bool:
+        return self._server is not None
+
+    def start(self, loop=None) -> bool:
+        """Bind the socket; False if another live timer already owns it.
+
+        With ``loop`` (a ``stellar_loop.EventLoop``) subscribers are accepted
+        on that loop instead of a thread; a later ``start(loop)`` moves the
+        socket to the new loop.
+        """
+        if self._server:
+            if loop is not None and self._loop is not None and loop is not self._loop:
+                self._loop = loop
+                loop.add_reader(self._server, self._accept_ready)
+            return True
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            srv.bind(self.path)
+        except OSError:
+            if _is_live(self.path):
+                srv.close()
+                return False
+            # Stale socket from a crashed timer
+            try:
+                os.unlink(self.path)
+                srv.bind(self.path)
+            except OSError:
+                srv.close()
+                return False
+        srv.listen(16)
+        self._server = srv
+        if loop is None:
+            threading.Thread(target=self._accept_loop, daemon=True).start()
+        else:
+            srv.setblocking(False)
+            self._loop = loop
+            loop.add_reader(srv, self._accept_ready)
+        atexit.register(self.close)
+        return True
+
+    def _accept_loop(self):
+        while self._server:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._register, args=(conn,), daemon=True).start()
+
+    def _register(self, conn):
+        try:
+            conn.settimeout(2.0)
+            hello = conn.makefile('r').readline()
+        except OSError:
+            conn.close()
+            return
+        self._subscribe(conn, hello)
+
+    def _accept_ready(self):
+        # Loop mode: the hello line is collected without blocking the loop
+        try:
+            conn, _ = self._server.accept()
+        except (OSError, AttributeError):
+            return
+        conn.setblocking(False)
+        buf, loop = bytearray(), self._loop
+
+        def hello():
+            try:
+                chunk = conn.recv(4096)
+            except BlockingIOError:
+                return
+            except OSError:
+                chunk = b''
+            buf.extend(chunk)
+            if chunk and b'\n' not in buf:
+                return
+            loop.remove_reader(conn)
+            if chunk:
+                self._subscribe(conn, buf.split(b'\n', 1)[0])
+            else:
+                conn.close()
+
+        loop.add_reader(conn, hello)
+
+    def _subscribe(self, conn, hello):
+        try:
+            topics = set(json.loads(hello).get('topics') or ['*'])
+            conn.setblocking(False)
+        except (OSError, ValueError, AttributeError):
+            conn.close()
+            return
+        with self._lock:
+            self.subs.append((conn, topics))
+
+    def subscribers(self, topic: str) -> int:
+        """Subscribers that asked for ``topic`` by name (wildcard taps excluded)."""
+        with self._lock:
+            return sum(1 for _, t in self.subs if topic in t)
+
+    def publish(self, topic: str, **data) -> int:
+        """Push one event; returns how many subscribers received it."""
+        if not self.subs:
+            return 0
+        line = (json.dumps({'topic': topic, **data}, separators=(',', ':')) + '\n').encode()
+        sent, dead = 0, []
+        with self._lock:
+            for sub in self.subs:
+                conn, topics = sub
+                if topic not in topics and '*' not in topics:
+                    continue
+                try:
+                    conn.sendall(line)
+                    sent += 1
+                except OSError:
+                    dead.append(sub)
+            for sub in dead:
+                self.subs.remove(sub)
+                sub[0].close()
+        return sent
+
+    def close(self):
+        srv, self._server = self._server, None
+        if srv is None:
+            return
+        if self._loop is not None:
+            self._loop.remove_reader(srv)
+            self._loop = None
+        srv.close()
+        with self._lock:
+            for conn, _ in self.subs:
+                conn.close()
+            self.subs = []
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _is_live(path: str) -> bool:
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
+
+def _connect(topics, path: str) -> socket.socket:
+    """Connected, subscribed socket; OSError if no timer is publishing."""
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(path)
+        s.sendall((json.dumps({'topics': list(topics)}) + '\n').encode())
+    except OSError:
+        s.close()
+        raise
+    return s
+
+
+def subscribe(topics=('*',), path: str = BUS_PATH):
+    """Yield events pushed by the timer; returns when the bus closes.
+
+    Raises OSError straight away if no timer is publishing.
+    """
+    s = _connect(topics, path)
+    try:
+        for line in s.makefile('r'):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+    finally:
+        s.close()
+
+
+class Subscription:
+    """``subscribe()`` for a caller's own select loop: wait on ``fileno()``, then ``read()``.
+
+    Raises OSError straight away if no timer is publishing.
+    """
+
+    def __init__(self, topics=('*',), path: str = BUS_PATH):
+        self.sock = _connect(topics, path)
+        self._buf = b''
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def read(self):
+        """Events that have arrived (call once readable), or None when the bus has closed."""
+        try:
+            chunk = self.sock.recv(65536)
+        except OSError:
+            chunk = b''
+        if not chunk:
+            self.sock.close()
+            return None
+        # A line cut by recv() waits in _buf for the rest
+        *lines, self._buf = (self._buf + chunk).split(b'\n')
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+
+if __name__ == "__main__":
+    try:
+        for event in subscribe(sys.argv[1:] or ['*']):
+            print(event, flush=True)
+    except OSError:
+        print(f"No timer is publishing on {BUS_PATH}")
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Crash-safe checkpoint of the session in progress.
+
+A running timer keeps its live session in a small fixed-size sidecar
+next to the stats file and overwrites it in place, a single ``pwrite``
+per checkpoint no matter how long the history is. The stats themselves
+are written once, when the session ends.
+
+The file holds two slots written alternately, each with a sequence
+number and a CRC, so a torn write leaves the previous slot readable.
+A session moves IDLE → ACTIVE (progress) → FINAL (being recorded, with
+the date it is recorded under) → IDLE. After a crash the next start
+finds ACTIVE (resume it, or record it as aborted) or FINAL (record it
+unless a session with that date is already in the stats), so every
+session reaches the history exactly once.
+
+The owner holds an ``flock`` on the sidecar for as long as it runs; a
+second timer on the same file runs without checkpoints instead of
+fighting over it, and a lock that is free means the owner is gone.
+"""
+
+import fcntl
+import os
+import struct
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+MAGIC   = b'SCKP'
+VERSION = 1
+IDLE, ACTIVE, FINAL = 0, 1, 2
+
+# magic, version, state, completed | seq | elapsed, goal, distance | date (iso), user | crc32
+# distance is the goal while ACTIVE and the distance covered once FINAL
+SLOT = struct.Struct('<4sBBBxQddd32s64sI')
+SIZE = 2 * SLOT.size
+
+Record = namedtuple('Record', 'seq state user date elapsed goal distance completed')
+
+
+def checkpoint_path(data_file: Path, owner: str) -> Path:
+    """Sidecar of ``data_file`` for one timer program, e.g. ``.pomodoro_stats.json.stellar.ckpt``."""
+    data_file = Path(data_file)
+    return data_file.with_name(f"{data_file.name}.{owner}.ckpt")
+
+
+def recorded(store, rec: Record) -> bool:
+    """True if ``rec`` (FINAL) already reached ``store``.
+
+    Asked of the store itself (``has_session``, an indexed lookup on
+    SQLite) rather than of a loaded history, which a store may not keep
+    in memory. Matched on date to the second, distance and duration.
+    """
+    return rec.state == FINAL and store.has_session(rec.user, rec.date, rec.distance, rec.elapsed)
+
+
+class Checkpoint:
+    """Owner side of one sidecar; see the module docstring for the protocol."""
+
+    def __init__(self, fd: int):
+        self.fd  = fd
+        self.seq = max((r.seq for r in self._slots()), default=0)
+
+    @classmethod
+    def open(cls, path: Path):
+        """Create or open ``path`` and lock it; None if another live timer owns it."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        if os.fstat(fd).st_size < SIZE:
+            os.ftruncate(fd, SIZE)
+        return cls(fd)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    # ── Read ──────────────────────────────────────────────────────────────────
+    def _slots(self) -> list:
+        raw, out = os.pread(self.fd, SIZE, 0), []
+        for at in (0, SLOT.size):
+            f = SLOT.unpack_from(raw, at)
+            if f[0] != MAGIC or f[1] != VERSION:
+                continue
+            if zlib.crc32(raw[at:at + SLOT.size - 4]) != f[-1]:
+                continue                                   # torn write
+            out.append(Record(f[4], f[2], f[9].rstrip(b'\0').decode(), f[8].rstrip(b'\0').decode(),
+                              f[5], f[6], f[7], bool(f[3])))
+        return out
+
+    def load(self):
+        """The latest checkpoint left unfinished, or None."""
+        rec = max(self._slots(), key=lambda r: r.seq, default=None)
+        return rec if rec and rec.state != IDLE else None
+
+    # ── Write ─────────────────────────────────────────────────────────────────
+    def _write(self, state: int, user: str = '', date: str = '', elapsed: float = 0.0,
+               goal: float = 0.0, distance: float = 0.0, completed: bool = False, sync: bool = False):
+        if self.fd is None:
+            return
+        self.seq += 1
+        body = SLOT.pack(MAGIC, VERSION, state, int(completed), self.seq, elapsed, goal, distance,
+                         date.encode()[:32], user.encode()[:64], 0)[:-4]
+        os.pwrite(self.fd, body + struct.pack('<I', zlib.crc32(body)), (self.seq & 1) * SLOT.size)
+        if sync:
+            os.fdatasync(self.fd)
+
+    def save(self, user: str, date: str, elapsed: float, goal: float, distance_goal: float):
+        """Progress of the running session; page-cache only, survives a process crash."""
+        self._write(ACTIVE, user, date, elapsed, goal, distance_goal)
+
+    def finish(self, user: str, session: dict):
+        """Mark ``session`` as about to be recorded; durable before the stats write."""
+        self._write(FINAL, user, session['date'], session['duration'], 0.0, session['distance'],
+                    session['completed'], sync=True)
+
+    def clear(self):
+        """The session is in the stats; nothing left to recover."""
+        self._write(IDLE)
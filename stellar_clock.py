@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Drift-free mission clock shared by the stellar, poyo and backup timers.
+
+Elapsed time is derived from a monotonic clock instead of being summed
+from sleep() ticks, so scheduler jitter never accumulates. Pauses are
+recorded as (start, end) intervals and subtracted from the wall span.
+
+Any monotonic source can drive the clock; ``VirtualTime`` is the one the
+``--simulate`` modes use to run sessions faster than real time.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class VirtualTime:
+    """Simulated monotonic time source for ``MissionClock``.
+
+    With ``speed`` > 0 time runs that many times faster than real time.
+    With ``speed`` 0 it stands still until a clock waits, then jumps
+    straight to that clock's deadline, so a session costs one step per
+    deadline. ``wall()`` maps virtual seconds onto calendar time starting
+    at ``epoch``.
+    """
+
+    MIN_STEP = 1e-6      # keeps float rounding from stalling a deadline
+
+    def __init__(self, speed: float = 0.0, epoch: datetime = None):
+        self.speed  = float(speed)
+        self.epoch  = epoch or datetime.now()
+        self._t     = 0.0
+        self._real  = time.monotonic()
+        self._lock  = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            if self.speed:
+                return self._t + (time.monotonic() - self._real) * self.speed
+            return self._t
+
+    def advance(self, seconds: float):
+        """Jump forward, e.g. over the idle time between sessions."""
+        with self._lock:
+            self._t += max(seconds, 0.0)
+
+    def wait(self, event: threading.Event, timeout: float = None) -> bool:
+        """``Event.wait`` in virtual seconds; a held clock still waits for real."""
+        if timeout is None:
+            return event.wait()
+        if self.speed:
+            return event.wait(timeout / self.speed)
+        if event.is_set():
+            return True
+        self.advance(max(timeout, self.MIN_STEP))
+        return False
+
+    def sleep(self, seconds: float):
+        self.wait(threading.Event(), seconds)
+
+    def wall(self) -> datetime:
+        return self.epoch + timedelta(seconds=self())
+
+
+def wall_time(now) -> datetime:
+    """Calendar time as seen by a time source: simulated or real."""
+    return now.wall() if isinstance(now, VirtualTime) else datetime.now()
+
+
+class MissionClock:
+    """Monotonic elapsed-time source with pause intervals and deadline waits.
+
+    ``goal`` and ``marks`` are expressed in elapsed seconds; ``wait()``
+    sleeps only until the next ``tick`` boundary (a whole second by
+    default, None for marks only), the next mark or the goal, whichever
+    comes first. Pausing is reason-based (``'user'``, ``'sub'``
+    ...) so a subscreen hold and a user pause never cancel each other.
+    """
+
+    def __init__(self, goal: float = 0.0, marks=(), elapsed: float = 0.0,
+                 now=time.monotonic, tick: float = 1.0):
+        self._now     = now
+        self.tick     = tick
+        self._lock    = threading.Lock()
+        self._wake    = threading.Event()
+        self.goal     = float(goal)
+        self.marks    = sorted(float(m) for m in marks)
+        self.pauses   = []               # closed (start, end) intervals, monotonic
+        self._base    = float(elapsed)   # elapsed before start(), e.g. a recovered session
+        self._started = None
+        self._held    = set()
+        self._hold_t  = None
+        self._paused_total = 0.0
+        self._stopped = False
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self, elapsed: float = None):
+        """(Re)start the span at ``elapsed``; active holds are kept."""
+        with self._lock:
+            if elapsed is not None:
+                self._base     = float(elapsed)
+            self._started      = self._now()
+            self._paused_total = 0.0
+            self.pauses        = []
+            self._stopped      = False
+            self._hold_t       = self._started if self._held else None
+        self._wake.set()
+
+    def stop(self):
+        """Freeze the readout and release any waiter for good."""
+        frozen = self.elapsed
+        with self._lock:
+            self._base    = frozen
+            self._started = None
+            self._hold_t  = None
+            self._stopped = True
+        self._wake.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    # ── Pause intervals ───────────────────────────────────────────────────────
+    def pause(self, reason: str = 'user'):
+        with self._lock:
+            if not self._held and self._started is not None:
+                self._hold_t = self._now()
+            self._held.add(reason)
+        self._wake.set()
+
+    def resume(self, reason: str = 'user'):
+        with self._lock:
+            self._held.discard(reason)
+            if not self._held and self._hold_t is not None:
+                end = self._now()
+                self.pauses.append((self._hold_t, end))
+                self._paused_total += end - self._hold_t
+                self._hold_t = None
+        self._wake.set()
+
+    def toggle(self, reason: str = 'user') -> bool:
+        if reason in self._held:
+            self.resume(reason)
+        else:
+            self.pause(reason)
+        return self.is_held(reason)
+
+    def is_held(self, reason: str = 'user') -> bool:
+        return reason in self._held
+
+    @property
+    def paused(self) -> bool:
+        return bool(self._held)
+
+    # ── Readout ───────────────────────────────────────────────────────────────
+    @property
+    def elapsed(self) -> float:
+        with self._lock:
+            if self._started is None:
+                return self._base
+            end = self._hold_t if self._hold_t is not None else self._now()
+            return self._base + (end - self._started) - self._paused_total
+
+    @property
+    def done(self) -> bool:
+        return self.goal > 0 and self.elapsed >= self.goal
+
+    def next_deadline(self, elapsed: float = None) -> float:
+        """Elapsed value of the next meaningful event: tick, mark or goal."""
+        e    = self.elapsed if elapsed is None else elapsed
+        nxt  = (int(e / self.tick) + 1) * self.tick if self.tick else float('inf')
+        for m in self.marks:
+            if m > e:
+                nxt = min(nxt, m)
+                break
+        if self.goal > e:
+            nxt = min(nxt, self.goal)
+        return nxt
+
+    def wait(self) -> float:
+        """Block until the next deadline (or forever while paused).
+
+        Returns early on pause/resume/stop so callers can react at once.
+        """
+        self._wake.clear()
+        if self._stopped:
+            return self.elapsed
+        if self.paused:
+            self._block(None)
+        else:
+            e  = self.elapsed
+            dl = self.next_deadline(e)
+            self._block(max(dl - e, 0.0) if dl != float('inf') else None)
+        return self.elapsed
+
+    def _block(self, timeout):
+        wait = getattr(self._now, 'wait', None)
+        if wait is not None:
+            wait(self._wake, timeout)
+        else:
+            self._wake.wait(timeout)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Headless stellar timer daemon.
+
+Runs focus sessions for a whole team on one asyncio event loop. Each
+navigator's session is a ``MissionClock`` plus an entry in a single
+deadline heap (next milestone or completion), so idle sessions cost
+nothing and there is no thread per session. Session bookkeeping goes
+through ``StellarTimer._add_session`` and the same milestone table and
+rank tiers as the interactive timer.
+
+Control socket protocol: one JSON object per line, one reply per line.
+
+    {"cmd": "start",  "user": "avsn17", "distance": 250}
+    {"cmd": "pause" | "resume" | "toggle" | "stop" | "query", "user": "avsn17"}
+    {"cmd": "list"}
+
+Replies carry ``"ok"``; failures add an ``"error"`` instead of a view,
+e.g. a ``start`` whose distance is not a positive number of meters.
+
+    python3 stellar_daemon.py                   — serve on DAEMON_PATH
+    python3 stellar_daemon.py --bench 1000 10000 — CPU use per session count
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pomodoro_timer2 import StellarTimer, MILESTONE_MSGS, METERS_PER_MINUTE, get_rank
+from stellar_bus import _is_live
+from stellar_clock import MissionClock
+from stellar_metrics import INTERVAL, METRICS_PATH, MetricsExporter, metrics_file
+
+DAEMON_PATH = os.environ.get('STELLAR_DAEMON', '/tmp/stellar_daemon.sock')
+
+
+class HeadlessSession:
+    __slots__ = ('user', 'distance_goal', 'clock', 'gen', 'hit')
+
+    def __init__(self, user: str, distance_goal: int):
+        goal               = (distance_goal / METERS_PER_MINUTE) * 60
+        self.user          = user
+        self.distance_goal = distance_goal
+        self.clock         = MissionClock(goal, [goal * p / 100 for p in sorted(MILESTONE_MSGS)])
+        self.gen           = 0        # bumped on pause/stop to void queued deadlines
+        self.hit           = set()
+
+    def view(self) -> dict:
+        e = self.clock.elapsed
+        return {'user': self.user, 'elapsed': round(e, 1), 'goal': self.clock.goal,
+                'paused': self.clock.paused, 'distance': round((e / 60) * METERS_PER_MINUTE, 2),
+                'percent': int(e / self.clock.goal * 100) if self.clock.goal else 0}
+
+
+class TimerDaemon:
+    """Many concurrent sessions keyed by navigator, driven by one timer heap."""
+
+    def __init__(self, engine: StellarTimer = None, verbose: bool = True):
+        self.engine   = engine or StellarTimer()
+        self.sessions = {}
+        self.heap     = []            # (deadline, seq, user, gen)
+        self.verbose  = verbose
+        self.fired    = 0
+        self._seq     = itertools.count()
+        self._handle  = None
+        self._armed   = None
+
+    # ── Heap ──────────────────────────────────────────────────────────────────
+    def _schedule(self, s: HeadlessSession):
+        e = s.clock.elapsed
+        nxt = next((m for m in s.clock.marks if m > e), s.clock.goal)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(nxt - e, 0.0)
+        heapq.heappush(self.heap, (deadline, next(self._seq), s.user, s.gen))
+        if self._armed is None or deadline < self._armed:
+            self._arm(loop)
+
+    def _arm(self, loop):
+        if self._handle:
+            self._handle.cancel()
+        self._handle = self._armed = None
+        if self.heap:
+            self._armed  = self.heap[0][0]
+            self._handle = loop.call_at(self._armed, self._on_due)
+
+    def _on_due(self):
+        loop = asyncio.get_running_loop()
+        now  = loop.time()
+        if self.engine.metrics is not None:
+            self.engine._tick_late(now - self._armed)
+        while self.heap and self.heap[0][0] <= now:
+            _, _, user, gen = heapq.heappop(self.heap)
+            s = self.sessions.get(user)
+            if s is not None and s.gen == gen:
+                self._fire(s)
+        self._arm(loop)
+
+    def _fire(self, s: HeadlessSession):
+        self.fired += 1
+        e = s.clock.elapsed
+        for pct, mark in zip(sorted(MILESTONE_MSGS), s.clock.marks):
+            if pct < 100 and mark <= e and pct not in s.hit:
+                s.hit.add(pct)
+                self._log(f"{s.user}: {MILESTONE_MSGS[pct]}")
+        if s.clock.done:
+            self._finish(s, completed=True)
+        else:
+            self._schedule(s)
+
+    def _finish(self, s: HeadlessSession, completed: bool):
+        s.clock.stop()
+        s.gen += 1
+        del self.sessions[s.user]
+        e    = s.clock.elapsed
+        dist = (e / 60) * METERS_PER_MINUTE
+        self.engine._add_session(dist, e, completed=completed, user=s.user)
+        total = self.engine.stats.get(s.user, {}).get('total_distance', 0.0)
+        self._log(f"{s.user}: {MILESTONE_MSGS[100] if completed else 'aborted'} "
+                  f"— {dist:.0f} m, {get_rank(total)}")
+
+    def _live_metrics(self):
+        # Metrics writer thread: elapsed of every running session
+        for s in list(self.sessions.values()):
+            yield 'stellar_session_elapsed_seconds', {'navigator': s.user}, s.clock.elapsed
+
+    def export_metrics(self, exporter: MetricsExporter):
+        exporter.collect(self._live_metrics)
+        self.engine.export_metrics(exporter)
+
+    def _log(self, msg: str):
+        if self.verbose:
+            print(f"[{time.strftime('%H:%M:%S')}] {msg}", flush=True)
+
+    # ── Commands ──────────────────────────────────────────────────────────────
+    def start(self, user: str, distance: int, elapsed: float = 0.0) -> dict:
+        goal = int(distance)
+        if goal <= 0:
+            # A zero goal is done at once and _fire would reschedule it at delay 0 forever
+            return {'ok': False, 'error': f"distance must be a positive number of meters, got {distance!r}"}
+        if user in self.sessions:
+            self._finish(self.sessions[user], completed=False)
+        s = self.sessions[user] = HeadlessSession(user, goal)
+        s.clock.start(elapsed)
+        self._schedule(s)
+        return s.view()
+
+    def pause(self, user: str) -> dict:
+        s = self.sessions[user]
+        s.clock.pause()
+        s.gen += 1
+        return s.view()
+
+    def resume(self, user: str) -> dict:
+        s = self.sessions[user]
+        if s.clock.paused:
+            s.clock.resume()
+            self._schedule(s)
+        return s.view()
+
+    def toggle(self, user: str) -> dict:
+        return self.resume(user) if self.sessions[user].clock.paused else self.pause(user)
+
+    def stop(self, user: str) -> dict:
+        s = self.sessions[user]
+        view = s.view()
+        self._finish(s, completed=False)
+        return view
+
+    def query(self, user: str) -> dict:
+        view = self.sessions[user].view()
+        view['rank'] = get_rank(self.engine.stats.get(user, {}).get('total_distance', 0.0))
+        return view
+
+    def list(self) -> dict:
+        paused = sum(1 for s in self.sessions.values() if s.clock.paused)
+        return {'active': len(self.sessions) - paused, 'paused': paused, 'queued': len(self.heap)}
+
+    def dispatch(self, req: dict) -> dict:
+        if not isinstance(req, dict):
+            return {'ok': False, 'error': 'expected a JSON object'}
+        cmd = req.get('cmd')
+        try:
+            if cmd == 'start':
+                return {'ok': True, **self.start(req['user'], req['distance'])}
+            if cmd in ('pause', 'resume', 'toggle', 'stop', 'query'):
+                return {'ok': True, **getattr(self, cmd)(req['user'])}
+            if cmd == 'list':
+                return {'ok': True, **self.list()}
+            return {'ok': False, 'error': f"unknown command {cmd!r}"}
+        except KeyError as e:
+            return {'ok': False, 'error': f"missing or unknown {e}"}
+        except (TypeError, ValueError) as e:
+            return {'ok': False, 'error': str(e)}
+
+    # ── Control socket ────────────────────────────────────────────────────────
+    async def _client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    reply = self.dispatch(json.loads(line))
+                except ValueError:
+                    reply = {'ok': False, 'error': 'bad json'}
+                writer.write((json.dumps(reply) + '\n').encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, path: str = DAEMON_PATH):
+        if _is_live(path):
+            raise RuntimeError(f"a daemon is already listening on {path}")
+        try:
+            os.unlink(path)                            # stale socket from a crashed daemon
+        except FileNotFoundError:
+            pass
+        server = await asyncio.start_unix_server(self._client, path=path)
+        self._log(f"✦ Stellar daemon listening on {path}")
+        async with server:
+            await server.serve_forever()
+
+
+# ─── BENCHMARK ────────────────────────────────────────────────────────────────
+async def _bench_one(n: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        d = TimerDaemon(StellarTimer(Path(tmp) / 'stats.json'), verbose=False)
+        rng = random.Random(n)
+        for i in range(n):
+            # 5–60 minute sessions joined part-way, so milestones and completions
+            # land inside the window
+            dist = rng.randint(50, 600)
+            d.start(f"nav{i:05d}", dist, rng.uniform(0, dist * 6))
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        await asyncio.sleep(seconds)
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        return {'sessions': n, 'seconds': round(wall, 2), 'cpu_percent': round(100 * cpu / wall, 2),
+                'events': d.fired, 'completed': n - len(d.sessions)}
+
+
+def bench(counts, seconds: float):
+    for n in counts:
+        print(json.dumps(asyncio.run(_bench_one(n, seconds))), flush=True)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Headless stellar timer daemon")
+    ap.add_argument('--socket', default=DAEMON_PATH)
+    ap.add_argument('--bench', type=int, nargs='*', metavar='N',
+                    help="measure CPU use with N active sessions (default: 1000 10000)")
+    ap.add_argument('--seconds', type=float, default=10.0, help="benchmark window per run")
+    ap.add_argument('--metrics', metavar='PATH', default=METRICS_PATH,
+                    help="write Prometheus textfile metrics to PATH (a file, or a directory for "
+                         "stellar_daemon.prom); default $STELLAR_METRICS")
+    ap.add_argument('--metrics-interval', type=float, default=INTERVAL, metavar='SECONDS')
+    args = ap.parse_args()
+    if args.bench is not None:
+        bench(args.bench or [1000, 10000], args.seconds)
+    else:
+        daemon   = TimerDaemon()
+        exporter = (MetricsExporter(metrics_file(args.metrics, 'stellar_daemon.prom'), args.metrics_interval)
+                    if args.metrics else None)
+        if exporter:
+            daemon.export_metrics(exporter)
+        try:
+            asyncio.run(daemon.serve(args.socket))
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as e:
+            sys.exit(f"✦ {e}")
+        finally:
+            if exporter:
+                exporter.close()
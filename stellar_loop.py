@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Single-threaded event loop for the interactive timers.
+
+One ``selectors`` wait multiplexes everything the UI reacts to: key
+presses on stdin, clock deadlines (next second, milestone, goal), signals
+such as SIGWINCH, IPC sockets and callbacks posted from other threads.
+The loop sleeps until the earliest of those, so a key is handled the
+moment it arrives and an idle or paused timer makes no wakeups at all.
+
+Signals and cross-thread calls share one self-pipe: ``signal.set_wakeup_fd``
+writes the signal number into it, ``call_soon_threadsafe`` a zero byte.
+"""
+
+import heapq
+import itertools
+import os
+import selectors
+import signal
+import threading
+import time
+from collections import deque
+
+_POSTED = 0      # self-pipe byte for call_soon_threadsafe; signals write their number
+
+
+class Timer:
+    """Handle returned by ``call_at`` / ``call_later``."""
+
+    __slots__ = ('when', 'callback', 'cancelled')
+
+    def __init__(self, when: float, callback):
+        self.when      = when
+        self.callback  = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class EventLoop:
+    def __init__(self, now=time.monotonic):
+        self.now      = now
+        self.sel      = selectors.DefaultSelector()
+        self.wakeups  = 0               # select() returns, for measuring idle cost
+        self._timers  = []              # heap of (when, seq, Timer)
+        self._seq     = itertools.count()
+        self._posted  = deque()
+        self._signals = {}
+        self._old_fd  = None
+        self._running = False
+        self._thread  = None
+        self._rfd, self._wfd = os.pipe()
+        os.set_blocking(self._rfd, False)
+        os.set_blocking(self._wfd, False)
+        self.sel.register(self._rfd, selectors.EVENT_READ, self._drain)
+
+    # ── Sources ───────────────────────────────────────────────────────────────
+    def add_reader(self, fileobj, callback):
+        """Call ``callback()`` whenever ``fileobj`` is readable."""
+        self.sel.register(fileobj, selectors.EVENT_READ, callback)
+
+    def remove_reader(self, fileobj):
+        try:
+            self.sel.unregister(fileobj)
+        except (KeyError, ValueError):
+            pass
+
+    def call_at(self, when: float, callback) -> Timer:
+        t = Timer(when, callback)
+        heapq.heappush(self._timers, (when, next(self._seq), t))
+        return t
+
+    def call_later(self, delay: float, callback) -> Timer:
+        return self.call_at(self.now() + max(delay, 0.0), callback)
+
+    def call_soon_threadsafe(self, callback):
+        """Run ``callback`` on the loop thread; safe from any thread."""
+        self._posted.append(callback)
+        try:
+            os.write(self._wfd, bytes((_POSTED,)))
+        except BlockingIOError:
+            pass                        # pipe full: a wakeup is already pending
+
+    def add_signal(self, signum: int, callback):
+        """Run ``callback()`` on the loop when ``signum`` arrives (main thread only)."""
+        if self._old_fd is None:
+            self._old_fd = signal.set_wakeup_fd(self._wfd)
+        self._signals[signum] = (callback, signal.signal(signum, lambda *_: None))
+
+    def _drain(self):
+        try:
+            data = os.read(self._rfd, 4096)
+        except BlockingIOError:
+            data = b''
+        for signum in set(data) - {_POSTED}:
+            if signum in self._signals:
+                self._signals[signum][0]()
+        while self._posted:
+            self._posted.popleft()()
+
+    # ── Running ───────────────────────────────────────────────────────────────
+    def _timeout(self):
+        while self._timers and self._timers[0][2].cancelled:
+            heapq.heappop(self._timers)
+        if not self._timers:
+            return None
+        return max(self._timers[0][0] - self.now(), 0.0)
+
+    def run_once(self, timeout: float = None):
+        """Wait for the next event or deadline and dispatch everything ready."""
+        wait = self._timeout()
+        if timeout is not None:
+            wait = timeout if wait is None else min(wait, timeout)
+        try:
+            events = self.sel.select(wait)
+        except InterruptedError:
+            events = []
+        self.wakeups += 1
+        for key, _ in events:
+            key.data()
+        now = self.now()
+        while self._timers and self._timers[0][0] <= now:
+            t = heapq.heappop(self._timers)[2]
+            if not t.cancelled:
+                t.callback()
+
+    def run(self):
+        """Dispatch until ``stop()``."""
+        self._running = True
+        self._thread  = threading.get_ident()
+        try:
+            while self._running:
+                self.run_once()
+        finally:
+            self._thread = None
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None and self._thread != threading.get_ident():
+            self.call_soon_threadsafe(lambda: None)
+
+    def close(self):
+        for signum, (_, old) in self._signals.items():
+            signal.signal(signum, old)
+        self._signals = {}
+        if self._old_fd is not None:
+            signal.set_wakeup_fd(self._old_fd)
+            self._old_fd = None
+        self.sel.close()
+        os.close(self._rfd)
+        os.close(self._wfd)
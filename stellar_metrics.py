@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Focus metrics for Prometheus' node_exporter textfile collector.
+
+Updating a counter or gauge is one dict store on the timer's own thread:
+no lock, no I/O. A writer thread renders the ``.prom`` file at most once per ``interval`` and
+only when something changed. It re-formats just the series whose value
+moved, then swaps the file in with an atomic rename so a scrape never
+sees half a file.
+
+    python3 pomodoro_timer2.py --metrics /var/lib/node_exporter/textfile_collector
+    STELLAR_METRICS=/var/lib/node_exporter/textfile_collector python3 stellar_daemon.py
+"""
+
+import os
+import threading
+from pathlib import Path
+
+METRICS_PATH = os.environ.get('STELLAR_METRICS')     # dir or .prom file; unset = off
+INTERVAL     = 15.0                                  # seconds between writes at most
+
+# name → (type, help); the file lists families in this order
+METRICS = {
+    'stellar_sessions_completed_total': ('counter', "Focus sessions that reached their goal."),
+    'stellar_sessions_aborted_total':   ('counter', "Focus sessions ended before their goal."),
+    'stellar_distance_meters_total':    ('counter', "Distance covered in focus sessions."),
+    'stellar_rank_tier':                ('gauge',   "Index of the navigator's tier in RANK_TIERS."),
+    'stellar_session_elapsed_seconds':  ('gauge',   "Elapsed time of the running session."),
+    'stellar_tick_jitter_seconds':      ('gauge',   "Worst clock tick lateness since the last write."),
+    'stellar_save_latency_seconds':     ('gauge',   "Duration of the last stats save."),
+}
+_ORDER = {name: i for i, name in enumerate(METRICS)}
+
+
+def metrics_file(path, default_name: str) -> Path:
+    """``path`` itself, or ``<path>/<default_name>`` when it is a directory."""
+    path = Path(path)
+    return path / default_name if path.is_dir() else path
+
+
+def _escape(v) -> str:
+    return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _line(key, value: float) -> str:
+    name, labels = key
+    body = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{name}{{{body}}} {value!r}\n" if body else f"{name} {value!r}\n"
+
+
+class MetricsExporter:
+    """Counters and gauges by ``(name, labels)``, written to ``path`` in the background."""
+
+    def __init__(self, path, interval: float = INTERVAL):
+        self.path       = Path(path)
+        self.interval   = interval
+        self.writes     = 0               # files actually written
+        self._values    = {}              # (name, labels) → value, set by the timers
+        self._peaks     = {}              # like _values, reset after every write
+        self._collect   = []              # callables run by the writer for live gauges
+        self._lines     = {}              # (name, labels) → (value, rendered line)
+        self._last      = None            # series written last time
+        self._stop      = threading.Event()
+        self._thread    = None
+
+    # ── Updates (any thread, never blocks) ────────────────────────────────────
+    def set(self, name: str, value: float, **labels):
+        self._values[(name, tuple(sorted(labels.items())))] = float(value)
+
+    def peak(self, name: str, value: float, **labels):
+        """Gauge holding the largest value seen since the last write."""
+        key = (name, tuple(sorted(labels.items())))
+        if value > self._peaks.get(key, float('-inf')):
+            self._peaks[key] = float(value)
+
+    def collect(self, fn):
+        """``fn()`` yields ``(name, labels, value)`` for gauges read at write time."""
+        self._collect.append(fn)
+
+    # ── Writer ────────────────────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        series       = dict(self._values)
+        peaks        = self._peaks
+        self._peaks  = {}
+        series.update(peaks)
+        for fn in self._collect:
+            for name, labels, value in fn():
+                series[(name, tuple(sorted(labels.items())))] = float(value)
+        return series
+
+    def render(self, series: dict) -> str:
+        lines, out = {}, []
+        for key, value in series.items():
+            old = self._lines.get(key)
+            lines[key] = old if old and old[0] == value else (value, _line(key, value))
+        self._lines = lines
+        by_name = {}
+        for key in sorted(lines, key=lambda k: k[1]):
+            by_name.setdefault(key[0], []).append(lines[key][1])
+        for name in sorted(by_name, key=lambda n: (_ORDER.get(n, len(_ORDER)), n)):
+            kind, text = METRICS.get(name, ('untyped', ''))
+            out.append(f"# HELP {name} {text}\n# TYPE {name} {kind}\n")
+            out.extend(by_name[name])
+        return ''.join(out)
+
+    def write(self, force: bool = False) -> bool:
+        """Write the file if any series changed; True if it was written."""
+        series = self.snapshot()
+        if series == self._last and not force:
+            return False
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(self.render(series))
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return False
+        self._last   = series
+        self.writes += 1
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='metrics', daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stop the writer and write the final values."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Desktop-notification plugins, called off the UI thread.
+
+Plugins are modules exposing any of ``notify_session_start(distance)``,
+``notify_milestone(percent)`` and ``notify_session_end(distance, rank)``;
+``STELLAR_NOTIFIERS`` lists them (default ``kirby_notify``). They are
+imported once, on the worker thread, and a plugin that fails to import
+is remembered as failed rather than retried on every event.
+
+``dispatch`` only puts the event on a bounded queue. When the queue is
+full the event is dropped and counted, so a slow or hung notifier can
+never hold up a frame or the completion path. Every call is timed per
+notifier; ``readout()`` gives counts and latencies.
+"""
+
+import atexit
+import importlib
+import os
+import queue
+import threading
+import time
+
+from stellar_profile import Histogram
+
+PLUGINS  = tuple(p.strip() for p in os.environ.get('STELLAR_NOTIFIERS', 'kirby_notify').split(',') if p.strip())
+MAXSIZE  = 64           # pending events; beyond this they are dropped
+_STOP    = object()
+
+
+class Notifier:
+    def __init__(self, plugins=PLUGINS, maxsize: int = MAXSIZE):
+        self.names    = tuple(plugins)
+        self.plugins  = {}                # name → module, once resolved
+        self.failed   = {}                # name → import error, never retried
+        self.latency  = {}                # name → Histogram of call time
+        self.errors   = {}                # name → calls that raised
+        self.dropped  = 0
+        self.profiler = None              # Profiler under --profile
+        self.resolved = threading.Event()
+        self._queue   = queue.Queue(maxsize)
+        self._thread  = None
+        self._lock    = threading.Lock()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self):
+        """Start the worker, which resolves the plugins first; idempotent."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='notify', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def close(self, timeout: float = 1.0):
+        """Deliver what is queued (waiting at most ``timeout``) and stop the worker."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _resolve(self):
+        for name in self.names:
+            try:
+                self.plugins[name] = importlib.import_module(name)
+            except Exception as e:
+                self.failed[name] = f"{type(e).__name__}: {e}"
+        self.resolved.set()
+
+    # ── Dispatch ──────────────────────────────────────────────────────────────
+    def dispatch(self, fn_name: str, *args):
+        """Queue ``fn_name(*args)`` for every plugin; never blocks."""
+        if self.resolved.is_set() and not self.plugins:
+            return                        # nothing installed; don't even queue
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((fn_name, args))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        self._resolve()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            fn_name, args = item
+            for name, mod in self.plugins.items():
+                fn = getattr(mod, fn_name, None)
+                if fn is None:
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    fn(*args)
+                except Exception:
+                    self.errors[name] = self.errors.get(name, 0) + 1
+                spent = time.perf_counter() - t0
+                self.latency.setdefault(name, Histogram()).add(spent)
+                if self.profiler is not None:
+                    self.profiler.observe(f"notify.{name}", spent)
+
+    # ── Readout ───────────────────────────────────────────────────────────────
+    def readout(self) -> list:
+        """One line per notifier: calls and latency, or why it is not loaded."""
+        if not self.resolved.is_set():
+            return ["resolving plugins…"] if self._thread else []
+        lines = []
+        for name in self.names:
+            if name in self.failed:
+                lines.append(f"{name}: not loaded ({self.failed[name]})")
+                continue
+            h = self.latency.get(name) or Histogram()
+            lines.append(f"{name}: {h.count} calls, mean {h.mean * 1e3:.1f} ms, "
+                         f"p99 {h.quantile(0.99) * 1e3:.1f} ms, max {max(h.max, 0.0) * 1e3:.1f} ms, "
+                         f"{self.errors.get(name, 0)} errors")
+        if self.dropped:
+            lines.append(f"{self.dropped} events dropped (queue full)")
+        return lines
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Hot-path instrumentation for ``--profile``.
+
+A ``Profiler`` keeps counters and latency histograms (log2 buckets from
+1 µs, with exact count, sum, min and max), can stream every sample to a
+JSON-lines file, and prints an aggregated report at exit.
+
+Nothing here runs unless profiling is on: ``Profiler.wrap`` replaces a
+method on one instance with a timed wrapper, and ``TimedWriter`` stands in
+for the renderer's stdout, so a timer started without ``--profile`` runs
+the plain methods with no checks in them.
+
+    python3 pomodoro_timer2.py --profile [--profile-out samples.jsonl]
+"""
+
+import functools
+import json
+import sys
+import threading
+import time
+
+BUCKETS = 32            # 2**31 µs ≈ 36 min, far beyond any frame or save
+
+
+class Histogram:
+    """Latency histogram in seconds; bucket k holds [2**(k-1), 2**k) µs."""
+
+    __slots__ = ('buckets', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * BUCKETS
+        self.count   = 0
+        self.total   = 0.0
+        self.min     = float('inf')
+        self.max     = float('-inf')
+
+    def add(self, seconds: float):
+        self.buckets[min(max(int(seconds * 1e6), 0).bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """The ``q`` quantile, interpolated within its bucket and kept within min..max."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for k, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lo, hi = (1 << k >> 1) / 1e6, (1 << k) / 1e6
+                return min(max(lo + (hi - lo) * (rank - seen) / n, self.min), self.max)
+            seen += n
+        return self.max
+
+
+class Profiler:
+    """Counters and histograms by name; thread-safe (the timer thread reports too)."""
+
+    def __init__(self, stream: str = None):
+        self.started  = time.perf_counter()
+        self.counters = {}
+        self.hists    = {}
+        self.stream   = open(stream, 'w') if stream else None
+        self._lock    = threading.Lock()
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            h = self.hists.get(name)
+            if h is None:
+                h = self.hists[name] = Histogram()
+            h.add(seconds)
+            if self.stream:
+                self.stream.write(f'{{"t": {time.perf_counter() - self.started:.6f}, '
+                                  f'"name": "{name}", "us": {seconds * 1e6:.1f}}}\n')
+
+    def wrap(self, obj, method: str, name: str):
+        """Time every call of ``obj.<method>`` under ``name`` (this instance only)."""
+        fn, clock = getattr(obj, method), time.perf_counter
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.observe(name, clock() - t0)
+
+        setattr(obj, method, timed)
+
+    # ── Report ────────────────────────────────────────────────────────────────
+    def summary(self) -> dict:
+        wall = time.perf_counter() - self.started
+        with self._lock:
+            return {'wall_s': round(wall, 3), 'counters': dict(self.counters),
+                    'histograms': {n: {'count': h.count, 'per_s': round(h.count / wall, 2) if wall else 0.0,
+                                       'mean_ms': round(h.mean * 1e3, 4),
+                                       'p50_ms': round(h.quantile(0.50) * 1e3, 4),
+                                       'p99_ms': round(h.quantile(0.99) * 1e3, 4),
+                                       'max_ms': round(h.max * 1e3, 4)}
+                                   for n, h in sorted(self.hists.items()) if h.count}}
+
+    def report(self) -> str:
+        s     = self.summary()
+        lines = [f"✦ profile over {s['wall_s']:.1f}s",
+                 f"  {'':<18}{'count':>8}{'/s':>8}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name, h in s['histograms'].items():
+            lines.append(f"  {name:<18}{h['count']:>8}{h['per_s']:>8.1f}{h['mean_ms']:>10.3f}"
+                         f"{h['p50_ms']:>10.3f}{h['p99_ms']:>10.3f}{h['max_ms']:>10.3f}")
+        for name, n in sorted(s['counters'].items()):
+            lines.append(f"  {name:<18}{n:>8}")
+        return '\n'.join(lines)
+
+    def close(self, out=None):
+        """Print the report (stderr by default) and close the sample stream."""
+        print(self.report(), file=out or sys.stderr)
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+
+class TimedWriter:
+    """Stand-in for a renderer's ``out``: times each frame's write + flush."""
+
+    def __init__(self, profiler: Profiler, name: str = 'stdout.write', out=None):
+        self.profiler = profiler
+        self.name     = name
+        self.out      = out
+        self._spent   = 0.0
+
+    def write(self, s: str):
+        t0 = time.perf_counter()
+        (self.out or sys.stdout).write(s)
+        self._spent += time.perf_counter() - t0
+        self.profiler.count('stdout.chars', len(s))
+
+    def flush(self):
+        t0 = time.perf_counter()
+        (self.out or sys.stdout).flush()
+        self.profiler.observe(self.name, self._spent + time.perf_counter() - t0)
+        self._spent = 0.0
+
+
+if __name__ == "__main__":
+    # Summarise a --profile-out sample file
+    prof, last = Profiler(), 0.0
+    with open(sys.argv[1]) as f:
+        for line in f:
+            rec  = json.loads(line)
+            last = rec['t']
+            prof.observe(rec['name'], rec['us'] / 1e6)
+    prof.started = time.perf_counter() - last     # rates over the recorded span
+    print(prof.report())
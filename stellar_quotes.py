@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Quote engine: category corpora, keyword routing and O(1) sampling.
+
+Categories come from a timer's built-in ``QUOTES`` dict plus external
+files in ``STELLAR_QUOTES`` (default ``~/.stellar_quotes``): one
+``<category>.txt`` per category, one quote per line, ``#`` lines
+ignored. A ``# keywords: a, b`` line routes chat messages containing
+any of those words to that category.
+
+Corpus files are memory-mapped, never read into Python strings. Each has
+a sidecar ``<category>.txt.idx`` with the byte span of every quote,
+built by one scan and reused while the file's mtime and size (or, failing
+that, its hash) are unchanged; it is mapped too. Startup and RSS stay
+flat in the corpus size, and sampling is one ``randrange`` and one slice
+decode of the quote returned.
+
+Messages are routed with one Aho-Corasick pass over the lowercased text
+(``KeywordMatcher``), built once per keyword table; the earliest route
+with a hit wins, as the old ``any(w in ml ...)`` chains did.
+"""
+
+import hashlib
+import mmap
+import os
+import random
+import struct
+from array import array
+from pathlib import Path
+
+CORPUS_DIR = Path(os.environ.get('STELLAR_QUOTES', Path.home() / '.stellar_quotes'))
+KEYWORDS   = '# keywords:'
+_KEYWORDS  = KEYWORDS.encode()
+
+# Sidecar index: header, keyword lines (padded to 8 bytes), then a uint64
+# (start, end) byte span per quote.
+# magic, version | source mtime_ns, size | blake2b-128 | quotes, keyword bytes
+INDEX_MAGIC   = b'SQIX'
+INDEX_VERSION = 1
+HEADER        = struct.Struct('<4sI qQ 16s QQ')
+
+
+# ─── KEYWORD MATCHER ──────────────────────────────────────────────────────────
+class KeywordMatcher:
+    """Aho-Corasick automaton over every route's keywords (plain substrings).
+
+    ``routes`` is an ordered sequence of ``(category, keywords)``; ``match``
+    returns the category of the earliest route with any keyword in the
+    text, or None.
+    """
+
+    def __init__(self, routes):
+        self.categories = []
+        goto, best = [{}], [len(routes)]          # best: lowest route index ending here
+        for prio, (category, words) in enumerate(routes):
+            self.categories.append(category)
+            for w in words:
+                node = 0
+                for ch in w.lower():
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = goto[node][ch] = len(goto)
+                        goto.append({})
+                        best.append(len(routes))
+                    node = nxt
+                best[node] = min(best[node], prio)
+
+        # Breadth-first failure links, folded into a full transition table (a DFA)
+        # so matching is one dict lookup per character; a node also reports
+        # what its suffixes report.
+        delta, fail = [dict(goto[0])] + [None] * (len(goto) - 1), [0] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            delta[node] = {**delta[fail[node]], **goto[node]} if node else delta[0]
+            for ch, nxt in goto[node].items():
+                fail[nxt] = delta[fail[node]].get(ch, 0) if node else 0
+                best[nxt] = min(best[nxt], best[fail[nxt]])
+                queue.append(nxt)
+        self._delta, self._best = delta, best
+
+    def match(self, text: str):
+        delta, best = self._delta, self._best
+        node, hit = 0, len(self.categories)
+        for ch in text.lower():
+            node = delta[node].get(ch, 0)
+            if best[node] < hit:
+                hit = best[node]
+                if hit == 0:
+                    break
+        return self.categories[hit] if hit < len(self.categories) else None
+
+
+# ─── QUOTE STORE ──────────────────────────────────────────────────────────────
+class Segment:
+    """Quotes as ``(start, end)`` byte spans into one UTF-8 buffer (bytes or mmap)."""
+
+    __slots__ = ('buf', 'spans')
+
+    def __init__(self, buf, spans):
+        self.buf   = buf
+        self.spans = spans              # flat start, end, start, end, ... (uint64)
+
+    @classmethod
+    def of(cls, quotes):
+        """A segment over a fresh blob holding ``quotes`` (an iterable of str)."""
+        blob, spans = bytearray(), array('Q')
+        for q in quotes:
+            spans.append(len(blob))
+            blob += q.encode()
+            spans.append(len(blob))
+        return cls(bytes(blob), spans)
+
+    def __len__(self) -> int:
+        return len(self.spans) // 2
+
+    def __getitem__(self, i: int) -> str:
+        return self.buf[self.spans[2 * i]:self.spans[2 * i + 1]].decode()
+
+
+class QuoteStore:
+    """Category → segments. Only the quote asked for is ever decoded."""
+
+    def __init__(self):
+        self.segments = {}
+        self.sizes    = {}
+
+    def add(self, category: str, segment: Segment) -> int:
+        """Extend ``category`` with ``segment``; returns the category's new size."""
+        if len(segment):
+            self.segments.setdefault(category, []).append(segment)
+            self.sizes[category] = self.sizes.get(category, 0) + len(segment)
+        return self.count(category)
+
+    def __len__(self) -> int:
+        return sum(self.sizes.values())
+
+    def __contains__(self, category: str) -> bool:
+        return category in self.sizes
+
+    def categories(self) -> tuple:
+        return tuple(self.sizes)
+
+    def count(self, category: str) -> int:
+        return self.sizes.get(category, 0)
+
+    def get(self, category: str, i: int) -> str:
+        for seg in self.segments[category]:
+            if i < len(seg):
+                return seg[i]
+            i -= len(seg)
+        raise IndexError('quote index out of range')
+
+    def sample(self, category: str = None, rng=random) -> str:
+        """A uniformly random quote of ``category`` (or of a random category)."""
+        if category is None:
+            category = rng.choice(self.categories())
+        return self.get(category, rng.randrange(self.sizes[category]))
+
+
+# ─── CORPUS FILES ─────────────────────────────────────────────────────────────
+def index_path(path: Path) -> Path:
+    """Offset index sidecar of a corpus file, e.g. ``kant.txt.idx``."""
+    return path.with_name(path.name + '.idx')
+
+
+def _digest(buf) -> bytes:
+    return hashlib.blake2b(buf, digest_size=16).digest()
+
+
+def _scan(buf):
+    """``(spans, keywords)`` of a corpus file: one quote per non-comment line."""
+    spans, keywords, pos, size = array('Q'), [], 0, len(buf)
+    while pos < size:
+        end = buf.find(b'\n', pos)
+        if end < 0:
+            end = size
+        line = buf[pos:end]
+        text = line.strip()
+        if text.lower().startswith(_KEYWORDS):
+            keywords.extend(w.strip() for w in text[len(_KEYWORDS):].decode().split(',') if w.strip())
+        elif text and not text.startswith(b'#'):
+            lead = pos + len(line) - len(line.lstrip())
+            spans.extend((lead, lead + len(text)))
+        pos = end + 1
+    return spans, keywords
+
+
+def _load_index(idx: Path, st, buf):
+    """``(spans, keywords)`` from a sidecar that still matches the source, else None.
+
+    Same mtime and size is trusted as is; otherwise the index survives
+    only if the content hash is unchanged (a touch, a copy).
+    """
+    try:
+        with open(idx, 'rb') as f:
+            imm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(imm) < HEADER.size:
+        return None
+    magic, version, mtime, size, digest, count, kwlen = HEADER.unpack_from(imm)
+    body = HEADER.size + _pad(kwlen)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION or size != st.st_size \
+            or len(imm) != body + 16 * count:
+        return None
+    if mtime != st.st_mtime_ns:
+        if digest != _digest(buf):
+            return None
+        _write_header(idx, st, digest, count, kwlen)
+    keywords = imm[HEADER.size:HEADER.size + kwlen].decode().split('\n') if kwlen else []
+    return memoryview(imm)[body:].cast('Q'), keywords
+
+
+def _pad(n: int) -> int:
+    return -(-n // 8) * 8
+
+
+def _write_header(idx: Path, st, digest: bytes, count: int, kwlen: int):
+    try:
+        fd = os.open(idx, os.O_WRONLY)
+        try:
+            os.pwrite(fd, HEADER.pack(INDEX_MAGIC, INDEX_VERSION, st.st_mtime_ns, st.st_size,
+                                      digest, count, kwlen), 0)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _save_index(idx: Path, st, buf, spans, keywords):
+    """Write the sidecar atomically; a read-only corpus dir just goes unindexed."""
+    kw  = '\n'.join(keywords).encode()
+    tmp = idx.with_name(f"{idx.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, st.st_mtime_ns, st.st_size,
+                                _digest(buf), len(spans) // 2, len(kw)))
+            f.write(kw.ljust(_pad(len(kw)), b'\0'))
+            spans.tofile(f)
+        os.replace(tmp, idx)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def open_corpus(path: Path):
+    """``(Segment, keywords)`` over a memory-mapped corpus file, or None if empty.
+
+    The offset index is read from the sidecar, or built with one scan
+    and saved there when missing or stale. Rewrite a corpus file by
+    replacing it rather than truncating it in place while a timer runs.
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if not st.st_size:
+            return None
+        buf = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+    idx    = index_path(path)
+    loaded = _load_index(idx, st, buf)
+    if loaded is None:
+        loaded = _scan(buf)
+        _save_index(idx, st, buf, *loaded)
+        loaded = _load_index(idx, st, buf) or loaded
+        buf.madvise(mmap.MADV_DONTNEED)                 # the scan touched every page
+    spans, keywords = loaded
+    return Segment(buf, spans), keywords
+
+
+def load_corpus(builtin: dict, corpus_dir: Path = None):
+    """``(QuoteStore, extra_routes)`` from ``builtin`` plus ``<category>.txt`` files.
+
+    A file extends the built-in category of the same name; its keyword
+    lines become routes for categories that have them.
+    """
+    corpus_dir = Path(corpus_dir or CORPUS_DIR)
+    files      = {p.stem: p for p in sorted(corpus_dir.glob('*.txt'))} if corpus_dir.is_dir() else {}
+    store, routes = QuoteStore(), []
+    for category in list(builtin) + [c for c in files if c not in builtin]:
+        if category in builtin:
+            store.add(category, Segment.of(builtin[category]))
+        opened = open_corpus(files[category]) if category in files else None
+        if opened:
+            store.add(category, opened[0])
+            if opened[1]:
+                routes.append((category, opened[1]))
+    return store, routes
+
+
+class QuoteEngine:
+    """Routes a chat message to a category and samples a quote from it."""
+
+    def __init__(self, builtin: dict, routes, corpus_dir: Path = None, fallback: str = None):
+        self.store, extra = load_corpus(builtin, corpus_dir)
+        self.matcher      = KeywordMatcher([r for r in list(routes) + extra if r[0] in self.store])
+        self.fallback     = fallback
+
+    def category(self, msg: str) -> str:
+        """Routed category; the fallback (a random category by default) on no hit."""
+        return self.matcher.match(msg) or self.fallback or random.choice(self.store.categories())
+
+    def reply(self, msg: str) -> str:
+        return self.store.sample(self.category(msg))
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Stellar rank tiers by total distance.
+
+Kept apart from the timer so light readers (``kirby_widget.py`` turns
+the shared-memory segment's rank index into a name) need not import
+the whole engine.
+"""
+
+RANK_TIERS = [
+    (0,     "⚫ Brown Dwarf"),
+    (100,   "🟡 Yellow Dwarf"),
+    (500,   "🔵 Blue Giant"),
+    (1000,  "🔴 Red Supergiant"),
+    (2500,  "💥 Supernova"),
+    (5000,  "⚡ Neutron Star"),
+    (10000, "🌌 Singularity"),
+]
+
+
+def get_rank_index(total_m: float) -> int:
+    idx = 0
+    for i, (threshold, _) in enumerate(RANK_TIERS):
+        if total_m >= threshold:
+            idx = i
+    return idx
+
+
+def get_rank(total_m: float) -> str:
+    return RANK_TIERS[get_rank_index(total_m)][1]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Diff-based terminal renderer for the stellar timer UI.
+
+Keeps the previous frame and emits only the cell runs that changed,
+addressed with cursor-positioning escapes. Each frame is written with a
+single ``write`` call and its encoded size is tracked so the bandwidth
+saving over a full clear-and-reprint is measurable.
+``FrameMeter`` reports the achieved frame rate and CPU share for the
+timer's debug overlay.
+"""
+
+import sys
+import time
+import unicodedata
+from collections import deque
+from functools import lru_cache
+
+CLEAR = "\033[H\033[2J"
+EOL   = "\033[K"
+# Unchanged cells bridged inside a run rather than paying for a new escape
+RUN_GAP = 6
+
+
+@lru_cache(maxsize=4096)
+def _is_wide(ch: str) -> bool:
+    return unicodedata.east_asian_width(ch) in ('W', 'F')
+
+
+def has_wide(s: str) -> bool:
+    """True if ``s`` holds a double-width glyph (cell index != screen column)."""
+    return not s.isascii() and any(_is_wide(ch) for ch in set(s))
+
+
+def _goto(r: int, c: int) -> str:
+    return f"\033[{r + 1};{c + 1}H"
+
+
+class FrameRenderer:
+    """Renders a grid of cells, writing only what changed since last frame.
+
+    ``rows`` is a sequence of rows, each a string (one char per cell) or a
+    list of single-cell strings. ``prefix``/``suffix`` wrap every non-empty
+    write (colour on / reset); a prefix change forces a full repaint, as
+    does a new terminal size.
+    Rows containing wide glyphs are rewritten whole, since their cell
+    indices no longer line up with screen columns.
+    """
+
+    def __init__(self, out=None):
+        self.out         = out
+        self.frames      = 0
+        self.last_bytes  = 0
+        self.total_bytes = 0
+        self.full_frames = 0
+        self._prev       = None   # list of row strings
+        self._prefix     = None
+
+    def invalidate(self):
+        """Forget the previous frame; the next render repaints everything."""
+        self._prev = None
+
+    @property
+    def bytes_per_frame(self) -> float:
+        return self.total_bytes / self.frames if self.frames else 0.0
+
+    def render(self, rows, prefix: str = "", suffix: str = "") -> int:
+        """Draw ``rows``; returns the number of bytes written this frame."""
+        cur = [r if isinstance(r, str) else ''.join(r) for r in rows]
+        if self._prev is None or prefix != self._prefix or len(cur) != len(self._prev):
+            payload = CLEAR + prefix + '\n'.join(cur) + suffix
+            self.full_frames += 1
+        else:
+            parts = []
+            for i, (new, old) in enumerate(zip(cur, self._prev)):
+                if new == old:
+                    continue
+                if len(new) != len(old) or has_wide(new) or has_wide(old):
+                    parts.append(_goto(i, 0) + new + EOL)
+                    continue
+                parts.extend(self._row_runs(i, old, new))
+            payload = prefix + ''.join(parts) + suffix if parts else ""
+
+        self._prev   = cur
+        self._prefix = prefix
+        n = len(payload.encode('utf-8'))
+        if payload:
+            out = self.out or sys.stdout
+            out.write(payload)
+            out.flush()
+        self.frames      += 1
+        self.last_bytes   = n
+        self.total_bytes += n
+        return n
+
+    @staticmethod
+    def _row_runs(r, old, new):
+        start = end = None
+        for j, (a, b) in enumerate(zip(old, new)):
+            if a == b:
+                continue
+            if start is None:
+                start = j
+            elif j - end > RUN_GAP:
+                yield _goto(r, start) + new[start:end + 1]
+                start = j
+            end = j
+        if start is not None:
+            yield _goto(r, start) + new[start:end + 1]
+
+
+class FrameMeter:
+    """Achieved frame rate and this process's CPU share over a sliding window."""
+
+    def __init__(self, window: float = 3.0):
+        self.window  = window
+        self.samples = deque()   # (monotonic, process CPU seconds) per frame
+
+    def frame(self):
+        now = time.monotonic()
+        self.samples.append((now, time.process_time()))
+        while now - self.samples[0][0] > self.window:
+            self.samples.popleft()
+
+    def fps(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+        span = self.samples[-1][0] - self.samples[0][0]
+        return (len(self.samples) - 1) / span if span > 0 else 0.0
+
+    def cpu_percent(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+        (t0, c0), (t1, c1) = self.samples[0], self.samples[-1]
+        return 100 * (c1 - c0) / (t1 - t0) if t1 > t0 else 0.0
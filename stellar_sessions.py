@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Columnar session history.
+
+A session dict with an ISO date string costs several hundred bytes in
+CPython; ``SessionColumns`` keeps the same history in typed ``array``
+columns instead (int64 epoch seconds, float64 distance and duration, a
+bitset for completion), about 24 bytes per session. It still behaves
+like the old list of dicts for existing callers: ``len()``, indexing,
+slicing and iteration hand back session dicts built on the fly.
+
+Aggregations run over whole columns, with NumPy when it is installed.
+"""
+
+from array import array
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EPOCH = datetime(1970, 1, 1)
+DAY   = 86400
+
+
+def to_epoch(date) -> int:
+    """Whole seconds since 1970-01-01 in the timestamp's own wall time (no tz shift)."""
+    try:
+        dt = datetime.fromisoformat(date).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return 0
+    return (dt - EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch(seconds: int) -> str:
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+class SessionColumns:
+    """Append-only session history stored column-wise; reads as a list of dicts."""
+
+    __slots__ = ('epoch', 'distance', 'duration', 'done', '_n')
+
+    def __init__(self, records=()):
+        self.epoch    = array('q')
+        self.distance = array('d')
+        self.duration = array('d')
+        self.done     = bytearray()      # completion bitset, bit i = session i
+        self._n       = 0
+        self.extend(records)
+
+    # ── Writes ────────────────────────────────────────────────────────────────
+    def append(self, session: dict):
+        n = self._n
+        self.epoch.append(to_epoch(session.get('date')))
+        self.distance.append(float(session.get('distance', 0.0)))
+        self.duration.append(float(session.get('duration', 0.0)))
+        if n % 8 == 0:
+            self.done.append(0)
+        if session.get('completed'):
+            self.done[n >> 3] |= 1 << (n & 7)
+        self._n = n + 1
+
+    def extend(self, records):
+        for s in records:
+            self.append(s)
+
+    # ── Sequence view ─────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return self._n
+
+    def is_completed(self, i: int) -> bool:
+        return bool(self.done[i >> 3] >> (i & 7) & 1)
+
+    def _record(self, i: int) -> dict:
+        return {'date': from_epoch(self.epoch[i]), 'distance': self.distance[i],
+                'duration': self.duration[i], 'completed': self.is_completed(i)}
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._record(j) for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError('session index out of range')
+        return self._record(i)
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self._record(i)
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"<SessionColumns {self._n} sessions, {self.nbytes} bytes>"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.itemsize * len(c) for c in (self.epoch, self.distance, self.duration)) + len(self.done)
+
+    # ── Aggregations ──────────────────────────────────────────────────────────
+    def _column(self, name: str):
+        if name not in ('epoch', 'distance', 'duration'):
+            raise ValueError(f"no column {name!r}")
+        col = getattr(self, name)
+        return np.frombuffer(col, dtype=np.int64 if name == 'epoch' else np.float64) if np else col
+
+    def total_distance(self) -> float:
+        return float(self._column('distance').sum()) if np and self._n else sum(self.distance)
+
+    def total_time(self) -> float:
+        return float(self._column('duration').sum()) if np and self._n else sum(self.duration)
+
+    def completed_count(self) -> int:
+        return int.from_bytes(self.done, 'little').bit_count()
+
+    def completion_ratio(self) -> float:
+        return self.completed_count() / self._n if self._n else 0.0
+
+    def per_day(self, column: str = 'distance') -> dict:
+        """{'YYYY-MM-DD': sum of ``column``} for each day with sessions."""
+        vals = self._column(column)
+        if np is not None and self._n:
+            days, inv = np.unique(np.frombuffer(self.epoch, dtype=np.int64) // DAY, return_inverse=True)
+            sums      = np.bincount(inv, weights=vals)
+            return {(EPOCH + timedelta(days=int(d))).date().isoformat(): float(s)
+                    for d, s in zip(days, sums)}
+        out = {}
+        for e, v in zip(self.epoch, vals):
+            out[e // DAY] = out.get(e // DAY, 0.0) + v
+        return {(EPOCH + timedelta(days=d)).date().isoformat(): s for d, s in sorted(out.items())}
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Shared-memory status segment for the stellar timer.
+
+The timer writes its live state into a fixed-layout ``mmap`` under
+``/dev/shm``; readers such as ``kirby_widget.py`` map it once and then
+read plain memory, so they can refresh at any rate without touching the
+filesystem. A seqlock guards consistency: the writer makes the sequence
+odd while it updates and even when done, and readers retry until they
+see the same even value on both sides of the copy.
+
+The seqlock assumes one writer, so the writer holds an ``flock`` on the
+file for as long as it runs; a second timer gets None from ``create()``
+and publishes nothing.
+
+The writer also stores its pid and refreshes the stamp at least every
+second while a session runs. A timer killed outright never clears
+``live``, so once the stamp is older than ``STALE`` (paused, or the
+writer is gone) readers check, at most once per ``STALE``, that the pid
+still exists, and report a segment whose writer is gone as not live.
+A fresh stamp costs readers no system call.
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+from pathlib import Path
+
+SHM_DIR  = Path('/dev/shm') if Path('/dev/shm').is_dir() else Path('/tmp')
+SHM_PATH = SHM_DIR / 'stellar_status'
+MAGIC    = b'STLR'
+VERSION  = 2      # 2: writer pid
+STALE    = 3.0    # seconds without a write before readers ask whether the writer exists
+
+# magic, version | seq | elapsed, goal, stamp (monotonic) | paused, live, pad | rank index, writer pid
+HEADER  = struct.Struct('<4sI')
+SEQ     = struct.Struct('<Q')
+PAYLOAD = struct.Struct('<dddBBxxii')
+SEQ_AT  = HEADER.size
+DATA_AT = SEQ_AT + SEQ.size
+SIZE    = DATA_AT + PAYLOAD.size
+
+Status = namedtuple('Status', 'seq elapsed goal stamp paused live rank pid')
+
+
+def pid_alive(pid: int) -> bool:
+    """True if a process with this pid exists (it may belong to another user)."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class StatusSegment:
+    """One writer, any number of readers, over a single mapped page."""
+
+    def __init__(self, mm: mmap.mmap):
+        self.mm       = mm
+        self.seq      = SEQ.unpack_from(mm, SEQ_AT)[0] & ~1
+        self.pid      = os.getpid()                    # stamped into every write
+        self.fd       = None                           # writer: holds the flock
+        self._checked = (None, 0.0, False)             # reader: (pid, when, alive)
+
+    @classmethod
+    def create(cls, path: Path = SHM_PATH):
+        """Writer side: create (or reuse), lock and map the segment; None if another timer writes it."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if os.fstat(fd).st_size < SIZE:
+                os.ftruncate(fd, SIZE)
+            mm = mmap.mmap(fd, SIZE)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except OSError:
+            os.close(fd)
+            raise
+        HEADER.pack_into(mm, 0, MAGIC, VERSION)
+        seg    = cls(mm)
+        seg.fd = fd                                    # kept open: the lock lives as long as we do
+        return seg
+
+    @classmethod
+    def attach(cls, path: Path = SHM_PATH):
+        """Reader side: map an existing segment, or None if there is none yet."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            if os.fstat(fd).st_size < SIZE:
+                return None
+            mm = mmap.mmap(fd, SIZE, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        if HEADER.unpack_from(mm, 0) != (MAGIC, VERSION):
+            mm.close()
+            return None
+        return cls(mm)
+
+    def write(self, elapsed: float, goal: float, paused: bool, rank: int, live: bool = True):
+        self.seq += 1                                  # odd: update in progress
+        SEQ.pack_into(self.mm, SEQ_AT, self.seq)
+        PAYLOAD.pack_into(self.mm, DATA_AT, elapsed, goal, time.monotonic(),
+                          int(paused), int(live), rank, self.pid)
+        self.seq += 1                                  # even: consistent again
+        SEQ.pack_into(self.mm, SEQ_AT, self.seq)
+
+    def close_session(self):
+        """Mark the segment as no longer live (the timer left its session)."""
+        s = self.read()
+        self.write(s.elapsed, s.goal, s.paused, s.rank, live=False)
+
+    def read(self, spins: int = 10000) -> Status:
+        """Consistent snapshot via the seqlock; spins only across a concurrent write.
+
+        A writer that died mid-update leaves the sequence odd; after ``spins``
+        attempts the last copy is returned as not live. So is a stale one
+        whose writer process no longer exists.
+        """
+        mm = self.mm
+        for _ in range(spins):
+            before = SEQ.unpack_from(mm, SEQ_AT)[0]
+            data   = PAYLOAD.unpack_from(mm, DATA_AT)
+            after  = SEQ.unpack_from(mm, SEQ_AT)[0]
+            if before == after and not before & 1:
+                break
+        else:
+            data = data[:4] + (0,) + data[5:]
+        e, g, stamp, paused, live, rank, pid = data
+        if live and time.monotonic() - stamp > STALE:
+            live = self._writer_alive(pid)
+        return Status(after, e, g, stamp, bool(paused), bool(live), rank, pid)
+
+    def _writer_alive(self, pid: int) -> bool:
+        # Only asked once the stamp is stale, and then at most once per STALE
+        seen, at, alive = self._checked
+        now = time.monotonic()
+        if pid != seen or now - at >= STALE:
+            alive         = pid_alive(pid)
+            self._checked = (pid, now, alive)
+        return alive
+
+    def live_elapsed(self, s: Status = None) -> float:
+        """Elapsed extrapolated to now, so readers can run finer than the writer."""
+        s = s or self.read()
+        if s.paused or not s.live:
+            return s.elapsed
+        return min(s.elapsed + time.monotonic() - s.stamp, s.goal or float('inf'))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Precomputed starfield layers.
+
+The star layer is generated once per terminal size and seed; each
+twinkle phase is baked into doubled row strings up front, so a frame is
+just one slice per row (a rotation by ``offset``) with no RNG calls and
+no per-cell allocation.
+"""
+
+import random
+
+STAR_CHARS     = ['·', '∙', '•', '✦', '✧', '★', '*', '⋆']
+TWINKLE_PHASES = 4
+TWINKLE_RATIO  = 4      # one star in N cycles through the palette
+
+
+class Starfield:
+    """Scrolling star layer cached per (cols, rows).
+
+    ``density`` is cells per star (the old per-frame loops used 25 and 40).
+    """
+
+    def __init__(self, chars=STAR_CHARS, density: int = 25, seed=None):
+        self.chars   = list(chars)
+        self.density = density
+        self.seed    = random.randrange(1 << 30) if seed is None else seed
+        self._size   = None
+        self._phases = []    # [phase][row] -> row string repeated twice
+
+    def _build(self, cols: int, rows: int):
+        rng   = random.Random(f"{self.seed}:{cols}x{rows}")
+        n     = len(self.chars)
+        cells = {}
+        for _ in range((cols * rows) // self.density):
+            twinkles = rng.randrange(TWINKLE_RATIO) == 0
+            cells[(rng.randrange(rows), rng.randrange(cols))] = (rng.randrange(n), twinkles)
+
+        self._phases = []
+        for p in range(TWINKLE_PHASES):
+            grid = [[' '] * cols for _ in range(rows)]
+            for (y, x), (ci, twinkles) in cells.items():
+                grid[y][x] = self.chars[(ci + p) % n if twinkles else ci]
+            self._phases.append([''.join(r) * 2 for r in grid])
+        self._size = (cols, rows)
+
+    def rows(self, cols: int, rows: int, offset: int = 0, phase: int = 0) -> list:
+        """Row strings shifted right by ``offset`` columns, at twinkle ``phase``."""
+        if self._size != (cols, rows):
+            self._build(cols, rows)
+        if cols <= 0:
+            return [''] * rows
+        o = cols - offset % cols
+        return [r[o:o + cols] for r in self._phases[phase % TWINKLE_PHASES]]
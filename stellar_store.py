@@ -0,0 +1,727 @@
+#!/usr/bin/env python3
+"""
+Session storage for the stellar timer.
+
+``JournalStore`` keeps stats as an append-only JSONL session log plus a
+small aggregates snapshot, so recording a session costs one appended
+line no matter how long the history is. Every ``COMPACT_EVERY`` appends
+the log tail is folded into the snapshot, which is replaced atomically
+(temp file + rename).
+
+``SQLiteStore`` is the optional indexed engine: sessions live in a table
+keyed by (user, date) and a per-user aggregates table is maintained in
+the same transaction, so leaderboards and totals are index lookups and
+startup never materialises the history.
+
+Either way a legacy ``~/.pomodoro_stats.json`` is imported on first load
+and never written again: StellarTimer, the backup timer and poyo all
+record through ``open_store()``, so every leaderboard sees every
+navigator. ``open_store()`` picks the backend by name.
+
+Both keep daily / ISO-weekly / monthly rollups per navigator (distance,
+time, completed and aborted counts) next to the aggregates, updated on
+every append, so period totals, streaks and heatmaps read buckets
+instead of sessions. ``python3 stellar_store.py --rebuild-rollups``
+regenerates them from the raw history in one streaming pass.
+
+Several timers may share one store. Every journal write takes an
+``fcntl`` lock on ``<data_file>.lock`` and appends under it after folding
+in whatever other processes appended since; SQLite does its own locking.
+
+Session histories are never parsed at startup: ``load()`` returns
+aggregates eagerly and each user's ``sessions`` as a ``LazySessions``
+that reads the history the first time a view iterates it.
+"""
+
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from datetime import date, timedelta
+from functools import lru_cache, partial
+from pathlib import Path
+
+from stellar_sessions import SessionColumns, to_epoch
+
+COMPACT_EVERY = 256
+AGG_KEYS      = ('total_distance', 'total_time', 'completed_sessions', 'session_count')
+PERIODS       = ('day', 'week', 'month')
+ROLLUP_KEYS   = ('distance', 'time', 'completed', 'aborted')
+SNAP_VERSION  = 2      # 2: rollups stored next to the aggregates
+
+
+# ─── LAZY HISTORY ─────────────────────────────────────────────────────────────
+class LazySessions:
+    """List-like session history, read from ``loader`` on first real use.
+
+    ``len()`` and ``append()`` work without loading when the stored count
+    is known; iteration and indexing load once into ``factory`` (columnar
+    ``SessionColumns`` by default) and cache.
+    """
+
+    __slots__ = ('_loader', '_items', '_pending', '_count', '_factory')
+
+    def __init__(self, loader, count: int = None, factory=SessionColumns):
+        self._loader  = loader
+        self._items   = None
+        self._pending = []
+        self._count   = count
+        self._factory = factory
+
+    @property
+    def loaded(self) -> bool:
+        return self._items is not None
+
+    def _list(self) -> list:
+        if self._items is None:
+            self._items   = self._factory(self._loader())
+            self._items.extend(self._pending)
+            self._pending = self._loader = None
+        return self._items
+
+    def append(self, session: dict):
+        (self._pending if self._items is None else self._items).append(session)
+
+    def __len__(self) -> int:
+        if self._items is None and self._count is not None:
+            return self._count + len(self._pending)
+        return len(self._list())
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __getitem__(self, i):
+        if i == -1 and self._items is None and self._pending:
+            return self._pending[-1]
+        return self._list()[i]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(self._items) if self.loaded else f"<LazySessions {len(self)}>"
+
+    def columns(self) -> SessionColumns:
+        """The loaded history itself, for column aggregations."""
+        return self._list()
+
+
+# ─── HELPERS ──────────────────────────────────────────────────────────────────
+def empty_user() -> dict:
+    return {'sessions': SessionColumns(), 'total_distance': 0.0, 'total_time': 0.0, 'completed_sessions': 0}
+
+
+def fold(aggs: dict, user: str, session: dict):
+    """Apply one session record to a per-user aggregates dict."""
+    a = aggs.setdefault(user, dict.fromkeys(AGG_KEYS, 0))
+    a['total_distance'] += session.get('distance', 0.0)
+    a['total_time']     += session.get('duration', 0.0)
+    a['session_count']  += 1
+    if session.get('completed'):
+        a['completed_sessions'] += 1
+
+
+def same_session(s: dict, date: str, distance: float, duration: float) -> bool:
+    """True if session ``s`` has this date (to the second), distance and duration."""
+    return (to_epoch(s.get('date')) == to_epoch(date) and round(s.get('distance', 0), 2) == round(distance, 2)
+            and round(s.get('duration', 0), 1) == round(duration, 1))
+
+
+# ─── LEADERBOARD INDEX ────────────────────────────────────────────────────────
+class RankIndex:
+    """Navigators ordered by total distance, best first, kept sorted as totals change.
+
+    Keys are ``(-distance, user)`` in a plain sorted list: top-k and pages
+    are slices, a navigator's rank is a bisection, and an update is one
+    delete plus one insert. Ties rank alphabetically.
+    """
+
+    def __init__(self, totals: dict = None):
+        self._dist = dict(totals or {})
+        self._keys = sorted((-d, u) for u, d in self._dist.items())
+
+    def update(self, user: str, distance: float):
+        old = self._dist.get(user)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, user))]
+        insort(self._keys, (-distance, user))
+        self._dist[user] = distance
+
+    def sync(self, totals: dict):
+        """Apply every total that changed, e.g. after re-reading a shared file."""
+        for user, distance in totals.items():
+            if self._dist.get(user) != distance:
+                self.update(user, distance)
+
+    def top(self, k: int = None, offset: int = 0) -> list:
+        """[(user, distance)] for ranks offset+1 .. offset+k."""
+        keys = self._keys[offset:offset + k if k else None]
+        return [(u, -d) for d, u in keys]
+
+    def rank(self, user: str):
+        """1-based position, or None for an unknown navigator."""
+        d = self._dist.get(user)
+        return None if d is None else bisect_left(self._keys, (-d, user)) + 1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# ─── ROLLUPS ──────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=4096)
+def _buckets(day: str) -> tuple:
+    y, w, _ = date.fromisoformat(day).isocalendar()
+    return day, f"{y}-W{w:02d}", day[:7]
+
+
+def bucket_keys(iso: str):
+    """(day, ISO week, month) bucket names for a session date, or None if unparseable."""
+    try:
+        return _buckets(iso[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def fold_rollups(rollups: dict, user: str, session: dict):
+    """Apply one session record to ``{user: {period: {bucket: [distance, time, completed, aborted]}}}``."""
+    keys = bucket_keys(session.get('date'))
+    if keys is None:
+        return
+    per  = rollups.setdefault(user, {p: {} for p in PERIODS})
+    slot = 2 if session.get('completed') else 3
+    for period, key in zip(PERIODS, keys):
+        b = per[period].setdefault(key, [0.0, 0.0, 0, 0])
+        b[0]    += session.get('distance', 0.0)
+        b[1]    += session.get('duration', 0.0)
+        b[slot] += 1
+
+
+def rollup_rows(buckets: dict, start: str = None, end: str = None) -> list:
+    """[(bucket, {distance, time, completed, aborted})] in order, within [start, end]."""
+    return [(k, dict(zip(ROLLUP_KEYS, v))) for k, v in sorted(buckets.items())
+            if (start is None or k >= start) and (end is None or k <= end)]
+
+
+def streaks(day_rows: list, today: date = None) -> tuple:
+    """(current, longest) run of consecutive days with a completed session."""
+    days = sorted(date.fromisoformat(k) for k, b in day_rows if b['completed'])
+    longest = run = 0
+    prev    = None
+    for d in days:
+        run     = run + 1 if prev is not None and d - prev == timedelta(days=1) else 1
+        longest = max(longest, run)
+        prev    = d
+    today = today or date.today()
+    # The current run survives until a whole day is missed
+    current = run if prev is not None and (today - prev).days <= 1 else 0
+    return current, longest
+
+
+def atomic_write(path: Path, text: str):
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+@contextmanager
+def file_lock(data_file: Path):
+    """Exclusive advisory lock on ``<data_file>.lock``, shared by every writer.
+
+    flock() locks belong to the open file, so two threads of one process
+    exclude each other too. Do not nest.
+    """
+    path = Path(data_file)
+    fd   = os.open(path.with_name(path.name + '.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def read_legacy(path: Path) -> dict:
+    """Parse a legacy stats file; anything unreadable counts as empty."""
+    try:
+        data = json.loads(Path(path).read_text())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def legacy_sessions(record: dict) -> list:
+    """A legacy user record's sessions; poyo's ``history`` of ``{ts, m}`` missions counts too."""
+    if isinstance(record.get('sessions'), list):
+        return record['sessions']
+    # poyo flew at 10 m per minute and only logged the distance
+    return [{'date': h.get('ts', ''), 'distance': h.get('m', 0.0), 'duration': h.get('m', 0.0) * 6,
+             'completed': True} for h in record.get('history') or () if isinstance(h, dict)]
+
+
+def legacy_totals(record: dict, sessions: list) -> dict:
+    """AGG_KEYS for a legacy user record; its stored totals win (they may predate pruning)."""
+    return {
+        'total_distance':     record.get('total_distance', record.get('total_m', 0.0)),
+        'total_time':         record.get('total_time', sum(s.get('duration', 0.0) for s in sessions)),
+        'completed_sessions': record.get('completed_sessions', sum(1 for s in sessions if s.get('completed'))),
+        'session_count':      len(sessions),
+    }
+
+
+# ─── JOURNAL STORE ────────────────────────────────────────────────────────────
+class JournalStore:
+    """Append-only session log + aggregates snapshot next to ``data_file``.
+
+    Files: ``<data_file>.log.jsonl`` (one session per line, with a ``user``
+    field) and ``<data_file>.snap.json`` (per-user totals and the log byte
+    offset they cover).
+    """
+
+    def __init__(self, data_file: Path):
+        self.legacy   = Path(data_file)
+        self.log_path = self.legacy.with_name(self.legacy.name + '.log.jsonl')
+        self.snap     = self.legacy.with_name(self.legacy.name + '.snap.json')
+        self.aggs     = {}
+        self.rollups  = {}
+        self.board    = RankIndex()
+        self.offset   = 0      # log bytes already folded into the snapshot
+        self.seen     = 0      # log bytes already folded into self.aggs (any writer's)
+        self.tail     = 0      # records past the snapshot
+        self.loaded   = False  # load() has run: legacy imported, snapshot read
+        self._mutex   = threading.RLock()
+
+    # ── Load ──────────────────────────────────────────────────────────────────
+    def load(self) -> dict:
+        """Return the stats dict ({user: {'sessions': LazySessions, totals...}}).
+
+        Only the snapshot and the log tail after it are read; histories
+        are parsed per user when first iterated.
+        """
+        with file_lock(self.legacy), self._mutex:
+            if not self.snap.exists() and not self.log_path.exists():
+                self._migrate()
+            self._repair_tail()
+            try:
+                snap = json.loads(self.snap.read_text())
+            except Exception:
+                snap = {}
+            self.aggs    = snap.get('users', {})
+            self.rollups = snap.get('rollups', {})
+            self.offset  = self.seen = snap.get('log_offset', 0)
+            self.tail    = 0
+            self._catch_up()
+            if snap and snap.get('version', 1) < SNAP_VERSION:
+                self._rebuild_rollups()
+            # Sorted once here; appends keep it in order from then on
+            self.board = RankIndex({u: a.get('total_distance', 0) for u, a in self.aggs.items()})
+            stats = {}
+            for user, a in self.aggs.items():
+                d = stats[user] = empty_user()
+                d['sessions'] = LazySessions(partial(self.iter_sessions, user, self.seen),
+                                             a.get('session_count'))
+                for k in ('total_distance', 'total_time', 'completed_sessions'):
+                    d[k] = a.get(k, 0)
+            if self.tail >= COMPACT_EVERY:
+                self._compact()
+            self.loaded = True
+        return stats
+
+    def _fresh(self):
+        # Writers that never call load() (poyo, backup) get the import and snapshot on first use
+        if self.loaded:
+            self._catch_up()
+        else:
+            self.load()
+
+    def _catch_up(self) -> int:
+        """Fold complete log lines past ``seen``, from any process, into memory (and ``tail``).
+
+        A line still being written has no newline yet and waits for the next call.
+        """
+        n = 0
+        with self._mutex:
+            try:
+                f = open(self.log_path, 'rb')
+            except FileNotFoundError:
+                return 0
+            with f:
+                f.seek(self.seen)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    self.seen += len(line)
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    user = rec.pop('user', '')
+                    fold(self.aggs, user, rec)
+                    fold_rollups(self.rollups, user, rec)
+                    self.board.update(user, self.aggs[user]['total_distance'])
+                    n += 1
+            self.tail += n
+        return n
+
+    def _records(self, start: int, end: int = None, prefix: bytes = b''):
+        """Yield (byte_offset, user, session) for each log line in [start, end).
+
+        Lines not starting with ``prefix`` are skipped unparsed.
+        """
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            pos = start
+            for line in f:
+                here, pos = pos, pos + len(line)
+                if end is not None and here >= end:
+                    break
+                if not line.startswith(prefix):
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                yield here, rec.pop('user', ''), rec
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+    # Each query first folds in what other timers appended since the last look
+    def leaderboard(self, limit: int = None, offset: int = 0) -> list:
+        """[(user, aggregates)] by total distance, best first; a page with ``offset``."""
+        self._fresh()
+        return [(u, self.aggs[u]) for u, _ in self.board.top(limit, offset)]
+
+    def rank(self, user: str):
+        self._fresh()
+        return self.board.rank(user)
+
+    def user_count(self) -> int:
+        self._fresh()
+        return len(self.board)
+
+    def totals(self, user: str) -> dict:
+        self._fresh()
+        return dict(self.aggs.get(user) or dict.fromkeys(AGG_KEYS, 0))
+
+    def rollup(self, user: str, period: str = 'day', start: str = None, end: str = None) -> list:
+        self._fresh()
+        return rollup_rows(self.rollups.get(user, {}).get(period, {}), start, end)
+
+    def rebuild_rollups(self) -> int:
+        """Regenerate every rollup from the raw log in one pass; returns sessions read."""
+        self._fresh()
+        with file_lock(self.legacy), self._mutex:
+            return self._rebuild_rollups()
+
+    def _rebuild_rollups(self) -> int:
+        self._catch_up()
+        rollups, n = {}, 0
+        for _, user, s in self._records(0, self.seen):
+            fold_rollups(rollups, user, s)
+            n += 1
+        self.rollups = rollups
+        self._compact()
+        return n
+
+    def sessions(self, user: str, end: int = None) -> list:
+        return list(self.iter_sessions(user, end))
+
+    def iter_sessions(self, user: str, end: int = None):
+        # Lines are written as {"user":...,...}, so other users' lines are skipped unparsed
+        prefix = b'{"user":' + json.dumps(user).encode() + b','
+        return (s for _, u, s in self._records(0, end, prefix) if u == user)
+
+    def has_session(self, user: str, date: str, distance: float, duration: float) -> bool:
+        """True if ``user``'s history holds this session; see ``same_session``."""
+        self._fresh()
+        return any(same_session(s, date, distance, duration) for s in self.iter_sessions(user))
+
+    def _repair_tail(self):
+        # A crash mid-append can leave a torn last line; cut back to the last newline
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(max(size - 65536, 0))
+            chunk = f.read()
+            if chunk.endswith(b'\n'):
+                return
+            cut = chunk.rfind(b'\n')
+            f.truncate(size - len(chunk) + cut + 1 if cut >= 0 else 0)
+
+    def _migrate(self):
+        legacy = read_legacy(self.legacy)
+        if not legacy:
+            return
+        lines, aggs, rollups = [], {}, {}
+        for user, d in legacy.items():
+            if not isinstance(d, dict):
+                continue
+            sessions = legacy_sessions(d)
+            for s in sessions:
+                lines.append(json.dumps({'user': user, **s}, separators=(',', ':')))
+                fold_rollups(rollups, user, s)
+            aggs[user] = legacy_totals(d, sessions)
+        body = ''.join(l + '\n' for l in lines)
+        atomic_write(self.log_path, body)
+        atomic_write(self.snap, json.dumps({'version': SNAP_VERSION, 'users': aggs, 'rollups': rollups,
+                                            'log_offset': len(body.encode('utf-8'))}))
+
+    # ── Write ─────────────────────────────────────────────────────────────────
+    def append(self, user: str, session: dict):
+        """Durably append one session record; O(1) in history size."""
+        line = json.dumps({'user': user, **session}, separators=(',', ':')) + '\n'
+        self._fresh()
+        with file_lock(self.legacy), self._mutex:
+            self._catch_up()
+            # Under the lock a line without its newline is a dead writer's; don't glue ours onto it
+            self._repair_tail()
+            with open(self.log_path, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            # Our line is now the last complete one; fold it the same way as anyone's
+            self._catch_up()
+            if self.tail >= COMPACT_EVERY:
+                self._compact()
+
+    def compact(self):
+        """Fold the log tail into the snapshot and swap it in atomically."""
+        self._fresh()
+        with file_lock(self.legacy), self._mutex:
+            self._compact()
+
+    def _compact(self):
+        # Caller holds the lock, so after catching up the aggregates cover the whole log
+        self._catch_up()
+        atomic_write(self.snap, json.dumps({'version': SNAP_VERSION, 'users': self.aggs,
+                                            'rollups': self.rollups, 'log_offset': self.seen}))
+        self.offset = self.seen
+        self.tail   = 0
+
+
+# ─── SQLITE STORE ─────────────────────────────────────────────────────────────
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id        INTEGER PRIMARY KEY,
+    user      TEXT    NOT NULL,
+    date      TEXT    NOT NULL,
+    distance  REAL    NOT NULL,
+    duration  REAL    NOT NULL,
+    completed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_user_date ON sessions(user, date);
+CREATE TABLE IF NOT EXISTS users (
+    user               TEXT PRIMARY KEY,
+    total_distance     REAL    NOT NULL DEFAULT 0,
+    total_time         REAL    NOT NULL DEFAULT 0,
+    completed_sessions INTEGER NOT NULL DEFAULT 0,
+    session_count      INTEGER NOT NULL DEFAULT 0
+);
+DROP INDEX IF EXISTS users_by_distance;
+CREATE INDEX IF NOT EXISTS users_by_rank ON users(total_distance DESC, user);
+CREATE TABLE IF NOT EXISTS rollups (
+    user      TEXT    NOT NULL,
+    period    TEXT    NOT NULL,
+    bucket    TEXT    NOT NULL,
+    distance  REAL    NOT NULL DEFAULT 0,
+    time      REAL    NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    aborted   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user, period, bucket)
+) WITHOUT ROWID;
+"""
+
+UPSERT_USER = """
+INSERT INTO users (user, total_distance, total_time, completed_sessions, session_count)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(user) DO UPDATE SET
+    total_distance     = total_distance     + excluded.total_distance,
+    total_time         = total_time         + excluded.total_time,
+    completed_sessions = completed_sessions + excluded.completed_sessions,
+    session_count      = session_count      + excluded.session_count
+"""
+
+UPSERT_ROLLUP = """
+INSERT INTO rollups (user, period, bucket, distance, time, completed, aborted)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(user, period, bucket) DO UPDATE SET
+    distance  = distance  + excluded.distance,
+    time      = time      + excluded.time,
+    completed = completed + excluded.completed,
+    aborted   = aborted   + excluded.aborted
+"""
+
+
+def _rollup_params(rollups: dict) -> list:
+    return [(user, period, bucket, *b) for user, per in rollups.items()
+            for period, buckets in per.items() for bucket, b in buckets.items()]
+
+
+class SQLiteStore:
+    """Indexed stats engine in ``<data_file>`` with a ``.db`` suffix.
+
+    ``load()`` returns aggregates only (empty ``sessions`` lists); history
+    is fetched per user with ``sessions()`` when a view needs it.
+    """
+
+    def __init__(self, data_file: Path, auto_import: bool = True):
+        self.legacy = Path(data_file)
+        self.path   = self.legacy.with_suffix('.db')
+        fresh       = not self.path.exists()
+        self._lock  = threading.Lock()
+        # SQLite does its own cross-process locking; wait for other writers, don't fail
+        self.db     = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        if fresh and auto_import and self.legacy.exists():
+            self.import_json(self.legacy)
+        elif not fresh and not self.db.execute("SELECT 1 FROM rollups LIMIT 1").fetchone():
+            # Database from before rollups existed
+            self.rebuild_rollups()
+
+    def import_json(self, path: Path) -> int:
+        """Import a legacy stats file; returns the number of sessions added."""
+        legacy, n = read_legacy(path), 0
+        with self._lock, self.db:
+            for user, d in legacy.items():
+                if not isinstance(d, dict):
+                    continue
+                sessions = legacy_sessions(d)
+                self.db.executemany(
+                    "INSERT INTO sessions (user, date, distance, duration, completed) VALUES (?, ?, ?, ?, ?)",
+                    [(user, s.get('date', ''), s.get('distance', 0.0), s.get('duration', 0.0),
+                      int(bool(s.get('completed')))) for s in sessions])
+                self.db.execute(UPSERT_USER, (user, *legacy_totals(d, sessions).values()))
+                rollups = {}
+                for s in sessions:
+                    fold_rollups(rollups, user, s)
+                self.db.executemany(UPSERT_ROLLUP, _rollup_params(rollups))
+                n += len(sessions)
+        return n
+
+    def load(self) -> dict:
+        stats = {}
+        for user, a in self.leaderboard():
+            d = stats[user] = empty_user()
+            for k in ('total_distance', 'total_time', 'completed_sessions'):
+                d[k] = a[k]
+        return stats
+
+    def append(self, user: str, session: dict):
+        with self._lock, self.db:
+            self.db.execute(
+                "INSERT INTO sessions (user, date, distance, duration, completed) VALUES (?, ?, ?, ?, ?)",
+                (user, session['date'], session['distance'], session['duration'], int(session['completed'])))
+            self.db.execute(UPSERT_USER, (user, session['distance'], session['duration'],
+                                          int(session['completed']), 1))
+            rollups = {}
+            fold_rollups(rollups, user, session)
+            self.db.executemany(UPSERT_ROLLUP, _rollup_params(rollups))
+
+    def compact(self):
+        pass
+
+    def leaderboard(self, limit: int = None, offset: int = 0) -> list:
+        # Walks users_by_rank (total_distance DESC, user); ties rank alphabetically like RankIndex
+        with self._lock:
+            cur = self.db.execute(
+                "SELECT user, total_distance, total_time, completed_sessions, session_count "
+                "FROM users ORDER BY total_distance DESC, user LIMIT ? OFFSET ?", (limit or -1, offset))
+            return [(r[0], dict(zip(AGG_KEYS, r[1:]))) for r in cur]
+
+    def rank(self, user: str):
+        with self._lock:
+            r = self.db.execute(
+                "SELECT 1 + (SELECT COUNT(*) FROM users o WHERE o.total_distance > u.total_distance "
+                "OR (o.total_distance = u.total_distance AND o.user < u.user)) "
+                "FROM users u WHERE u.user = ?", (user,)).fetchone()
+        return r[0] if r else None
+
+    def user_count(self) -> int:
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def totals(self, user: str) -> dict:
+        with self._lock:
+            r = self.db.execute(
+                "SELECT total_distance, total_time, completed_sessions, session_count "
+                "FROM users WHERE user = ?", (user,)).fetchone()
+        return dict(zip(AGG_KEYS, r or (0, 0, 0, 0)))
+
+    def rollup(self, user: str, period: str = 'day', start: str = None, end: str = None) -> list:
+        with self._lock:
+            cur = self.db.execute(
+                "SELECT bucket, distance, time, completed, aborted FROM rollups "
+                "WHERE user = ? AND period = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+                (user, period, start or '', end or '\uffff'))
+            return [(r[0], dict(zip(ROLLUP_KEYS, r[1:]))) for r in cur]
+
+    def rebuild_rollups(self) -> int:
+        """Regenerate the rollups table from ``sessions`` in one streaming pass."""
+        rollups, n = {}, 0
+        with self._lock, self.db:
+            for user, d, dist, dur, done in self.db.execute(
+                    "SELECT user, date, distance, duration, completed FROM sessions"):
+                fold_rollups(rollups, user, {'date': d, 'distance': dist, 'duration': dur, 'completed': done})
+                n += 1
+            self.db.execute("DELETE FROM rollups")
+            self.db.executemany(UPSERT_ROLLUP, _rollup_params(rollups))
+        return n
+
+    def sessions(self, user: str) -> list:
+        with self._lock:
+            cur = self.db.execute(
+                "SELECT date, distance, duration, completed FROM sessions "
+                "WHERE user = ? ORDER BY date", (user,))
+            return [{'date': d, 'distance': x, 'duration': t, 'completed': bool(c)}
+                    for d, x, t, c in cur]
+
+    def has_session(self, user: str, date: str, distance: float, duration: float) -> bool:
+        """True if ``user``'s history holds this session; see ``same_session``."""
+        # Range scan on sessions_user_date over every date within that second
+        second = str(date)[:19]
+        with self._lock:
+            cur = self.db.execute(
+                "SELECT date, distance, duration FROM sessions WHERE user = ? AND date >= ? AND date < ?",
+                (user, second, second + '\uffff'))
+            return any(same_session({'date': d, 'distance': x, 'duration': t}, date, distance, duration)
+                       for d, x, t in cur)
+
+
+# ─── FACTORY ──────────────────────────────────────────────────────────────────
+BACKENDS = {'journal': JournalStore, 'sqlite': SQLiteStore}
+
+
+def open_store(backend: str, data_file: Path):
+    """Instantiate the named backend; unknown names fall back to the journal."""
+    return BACKENDS.get(backend, JournalStore)(data_file)
+
+
+if __name__ == "__main__":
+    # python3 stellar_store.py [stats.json]                     — import a JSON stats file into SQLite
+    # python3 stellar_store.py --rebuild-rollups [--backend B]  — regenerate rollups from raw history
+    import argparse
+    ap = argparse.ArgumentParser(description="Stellar stats storage tools")
+    ap.add_argument('src', nargs='?', type=Path, default=Path.home() / '.pomodoro_stats.json')
+    ap.add_argument('--rebuild-rollups', action='store_true')
+    ap.add_argument('--backend', choices=sorted(BACKENDS),
+                    default=os.environ.get('STELLAR_BACKEND', 'journal'))
+    args = ap.parse_args()
+    if args.rebuild_rollups:
+        store = open_store(args.backend, args.src)
+        store.load()
+        print(f"✦ Rebuilt {args.backend} rollups from {store.rebuild_rollups()} sessions")
+    else:
+        store = SQLiteStore(args.src, auto_import=False)
+        print(f"✦ Imported {store.import_json(args.src)} sessions into {store.path}")
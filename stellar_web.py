@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Local HTTP bridge between the Python timer engine and pomodoro_web.html.
+
+Serves the page, streams timer state to the browser over Server-Sent
+Events and takes Engage / Pause / Reset back as POSTs. The engine is a
+``StellarTimer`` driven by its monotonic clock; the browser only renders.
+Each state change is diffed and encoded once, then the same bytes are
+queued to every open tab, so extra tabs cost a socket write each and no
+engine work.
+
+    python3 stellar_web.py [--port 8000] [--distance 250]
+    open http://localhost:8000/
+"""
+
+import argparse
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from pomodoro_timer2 import StellarTimer, METERS_PER_MINUTE, get_rank
+
+PAGE       = Path(__file__).parent / 'pomodoro_web.html'
+KEEPALIVE  = 15      # seconds between SSE comments on an idle stream
+CLIENT_BUF = 64      # queued deltas before a stalled tab is dropped
+
+
+class BridgeTimer(StellarTimer):
+    """StellarTimer whose clock ticks are forwarded to the bridge."""
+
+    def __init__(self, bridge):
+        self.bridge = bridge
+        super().__init__()
+
+    def _publish_tick(self):
+        super()._publish_tick()
+        self.bridge.push()
+
+    def _complete(self):
+        super()._complete()
+        self.bridge.push()
+
+
+class Bridge:
+    def __init__(self, distance: int = 250):
+        self.distance = distance
+        self.clients  = set()
+        self.state    = {}
+        self._lock    = threading.Lock()
+        self.timer    = BridgeTimer(self)
+        self._arm(distance)
+
+    def _arm(self, distance: int):
+        t = self.timer
+        t.running       = False
+        t.distance_goal = distance
+        t.time_goal     = (distance / METERS_PER_MINUTE) * 60
+        t.elapsed       = 0.0
+
+    # ── State ─────────────────────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        t = self.timer
+        e = t.elapsed
+        return {
+            'user':     t.user_name,
+            'elapsed':  int(e),
+            'goal':     int(t.time_goal),
+            'distance': round((e / 60) * METERS_PER_MINUTE),
+            'running':  t.running,
+            'paused':   t.paused,
+            'complete': t.time_goal > 0 and e >= t.time_goal,
+            'rank':     get_rank(t._total_distance()),
+        }
+
+    def push(self):
+        """Broadcast what changed since the last push, encoded once for all tabs."""
+        with self._lock:
+            new   = self.snapshot()
+            delta = {k: v for k, v in new.items() if self.state.get(k) != v}
+            if not delta:
+                return
+            self.state = new
+            msg = f"data: {json.dumps(delta)}\n\n".encode()
+            for q in list(self.clients):
+                try:
+                    q.put_nowait(msg)
+                except queue.Full:
+                    # The tab will reconnect and get a fresh snapshot
+                    self.clients.discard(q)
+
+    def subscribe(self):
+        q = queue.Queue(CLIENT_BUF)
+        with self._lock:
+            full = self.state = self.state or self.snapshot()
+            q.put_nowait(f"data: {json.dumps(full)}\n\n".encode())
+            self.clients.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self.clients.discard(q)
+
+    # ── Actions ───────────────────────────────────────────────────────────────
+    def action(self, name: str) -> bool:
+        t = self.timer
+        if name == 'start':
+            if t.paused:
+                t.paused = False
+            elif not t.running:
+                if t.elapsed >= t.time_goal:
+                    self._arm(self.distance)
+                t._start_timer()
+        elif name == 'pause':
+            if t.running:
+                t.paused = True
+        elif name == 'reset':
+            t.running = False
+            t.clock.stop()
+            t.paused = False
+            self._arm(self.distance)
+        else:
+            return False
+        self.push()
+        return True
+
+
+def make_handler(bridge: Bridge):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path in ('/', '/pomodoro_web.html'):
+                body = PAGE.read_bytes()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == '/events':
+                self._stream()
+            else:
+                self.send_error(404)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            q = bridge.subscribe()
+            try:
+                # Ends when the tab goes away or push() drops it for stalling
+                while q in bridge.clients:
+                    try:
+                        msg = q.get(timeout=KEEPALIVE)
+                    except queue.Empty:
+                        msg = b": keepalive\n\n"
+                    self.wfile.write(msg)
+                    self.wfile.flush()
+            except OSError:
+                pass
+            finally:
+                bridge.unsubscribe(q)
+
+        def do_POST(self):
+            if self.path != '/action':
+                self.send_error(404)
+                return
+            try:
+                size = int(self.headers.get('Content-Length', 0))
+                name = json.loads(self.rfile.read(size) or b'{}').get('action', '')
+            except ValueError:
+                name = ''
+            if bridge.action(name):
+                self.send_response(204)
+                self.end_headers()
+            else:
+                self.send_error(400, f"unknown action {name!r}")
+
+    return Handler
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serve pomodoro_web.html from the Python timer engine")
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8000)
+    ap.add_argument('--distance', type=int, default=250, help="session goal in meters (250 m = 25 min)")
+    args = ap.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(Bridge(args.distance)))
+    server.daemon_threads = True
+    print(f"✦ Stellar web bridge on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass